@@ -1,8 +1,13 @@
-from importlib import import_module
-import time
+from argparse import ArgumentParser
+from functools import partial
+import os
+from pathlib import Path
 import sys
-from advent.common import input
-from advent.days.template import Day, ResultType, is_day
+import time
+from typing import Any, Callable
+from advent.common import input, parallel
+from advent.days import Task, all_tasks, get_day, import_times, tasks_from_string
+from advent.days.template import Day, ParsingDay, ResultType, has_parse
 
 
 def output(day: int, part: int, result: ResultType | None, delta: float) -> None:
@@ -21,79 +26,190 @@ def output(day: int, part: int, result: ResultType | None, delta: float) -> None
             print('Day {0:02} Part {1}: (Unknown result type)'.format(day, part))
 
 
-def get_day(day_num: int) -> Day:
-    day_module = import_module('advent.days.day{0:02}.solution'.format(day_num))
-    if not is_day(day_module):
-        raise Exception(f'Not a valid day: {day_num}')
-
-    return day_module
+def parse_input(day: ParsingDay) -> tuple[Any, float]:
+    """ Parses the input of the given day and returns it with the time it took """
+    lines = input.read_lines(day.day_num, 'input.txt')
+    start_time = time.time()
+    parsed = day.parse(lines)
+    end_time = time.time()
+    return parsed, end_time - start_time
 
 
-def run(day: Day, part: int) -> float:
-    data = input.read_lines(day.day_num, 'input.txt')
+def solve(day: Day, part: int, data: Any) -> tuple[ResultType | None, float]:
+    """ Solves one part of the given day with the given input and returns the result and time """
     start_time = time.time()
     match part:
         case 1: result = day.part1(data)
         case 2: result = day.part2(data)
         case _: raise Exception(f'Unknown part {part}')
 
-    if result is None:
-        return 0.0
-
     end_time = time.time()
-    delta = end_time - start_time
-    output(day.day_num, part, result, delta)
-    return delta
+    return result, end_time - start_time
 
 
-def run_from_string(day_str: str) -> float:
-    match day_str.split('/'):
-        case [d]:
-            day_num = int(d)
-            day = get_day(day_num)
+def solve_day(day: Day, parts: list[int]) -> list[tuple[ResultType | None, float]]:
+    """
+    Solves the given parts of a day. Days with a parse hook parse their input only once
+    for all parts, the time is counted with the first part. The parsed input is not kept
+    """
+    parsed, parse_time = parse_input(day) if has_parse(day) else (None, 0.0)
+    results: list[tuple[ResultType | None, float]] = []
+    for part in parts:
+        data = parsed if has_parse(day) else input.read_lines(day.day_num, 'input.txt')
+        result, delta = solve(day, part, data)
+        results.append((result, parse_time + delta))
+        parse_time = 0.0
+    return results
 
-            if day_num == day.day_num:
-                p1 = run(day, 1)
-                p2 = run(day, 2)
-                return p1 + p2
 
-            assert False, "We should never get here"
+def solve_parts(day_num: int, parts: list[int]) -> list[tuple[ResultType | None, float]]:
+    """ Entry point for the worker processes, which only get to see the day number """
+    return solve_day(get_day(day_num), parts)
 
-        case [d, p]:
-            day_num = int(d)
-            day = get_day(day_num)
 
-            if day_num == day.day_num:
-                part = int(p)
-                return run(day, part)
+def parts_by_day(tasks: list[Task]) -> dict[int, list[int]]:
+    """ Groups the parts of the tasks by their day, keeping the order of the days """
+    result: dict[int, list[int]] = {}
+    for day_num, part in tasks:
+        result.setdefault(day_num, []).append(part)
+    return result
 
-            assert False, "We should never get here"
 
-        case _:
-            raise Exception(f'{day_str} is not a valid day description')
+def report(task: Task, result: ResultType | None, delta: float) -> float:
+    if result is None:
+        return 0.0
 
+    day_num, part = task
+    output(day_num, part, result, delta)
+    return delta
+
+
+def run(day: Day, parts: list[int]) -> float:
+    results = solve_day(day, parts)
+    return sum(report((day.day_num, part), *result) for part, result in zip(parts, results))
+
+
+def run_profiled(day: Day, parts: list[int], profile: bool, memory: bool,
+                 top: int, pstats_dir: Path | None) -> float:
+    """
+    Runs the parts of a day like run, but the parse hook and each part on its own within
+    cProfile and/or tracemalloc. Both slow the solution down, so the reported time is not
+    comparable to a normal run
+    """
+    from advent import profiling
+
+    def instrumented(action: Callable[[], Any], name: str) -> tuple[Any, float]:
+        if profile:
+            dump = None
+            if pstats_dir is not None:
+                pstats_dir.mkdir(parents=True, exist_ok=True)
+                dump = pstats_dir / f'day{day.day_num:02}-{name}.pstats'
+            action = partial(profiling.profile_call, action, top, dump)
+        if memory:
+            action = partial(profiling.trace_memory, action, top)
+
+        start_time = time.time()
+        result = action()
+        return result, time.time() - start_time
+
+    parsed, time_taken = None, 0.0
+    if has_parse(day):
+        parsed, time_taken = instrumented(
+            partial(day.parse, input.read_lines(day.day_num, 'input.txt')), 'parse')
+        print(f'Day {day.day_num:02} Parse: ({time_taken:0.3}s)')
+
+    for part in parts:
+        data = parsed if has_parse(day) else input.read_lines(day.day_num, 'input.txt')
+        match part:
+            case 1: solver = day.part1
+            case 2: solver = day.part2
+            case _: raise Exception(f'Unknown part {part}')
+        result, delta = instrumented(partial(solver, data), f'part{part}')
+        time_taken += report((day.day_num, part), result, delta)
+    return time_taken
+
+
+def run_parallel(tasks: list[Task], jobs: int) -> float:
+    """
+    Runs the days of all tasks in a pool of [jobs] processes. Results are still reported
+    in the order of the tasks. Every worker only gets its share of the cpus for the pools
+    a solution might create itself, so that we do not oversubscribe the machine.
+    The workers do not share parsed inputs, so all parts of a day go to the same worker
+    """
+    # imported here, as it pulls in multiprocessing, which a normal run does not need
+    from concurrent.futures import ProcessPoolExecutor
+
+    budget = (os.cpu_count() or 1) // jobs
+    time_taken = 0.0
+    with ProcessPoolExecutor(jobs, initializer=parallel.set_worker_budget,
+                             initargs=(budget,)) as executor:
+        futures = [(day_num, parts, executor.submit(solve_parts, day_num, parts))
+                   for day_num, parts in parts_by_day(tasks).items()]
+        for day_num, parts, future in futures:
+            for part, (result, delta) in zip(parts, future.result()):
+                time_taken += report((day_num, part), result, delta)
+    return time_taken
+
+
+def run_main(arguments: list[str]) -> None:
+    parser = ArgumentParser(prog='advent', description='Runs the Advent of Code solutions',
+                            epilog="use 'advent bench --help' to benchmark the solutions")
+    parser.add_argument('day', nargs='?', help='day[/part] to run, all days if omitted')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of days and parts to run in parallel')
+    parser.add_argument('--profile', action='store_true',
+                        help='run parse and each part within cProfile and report the hot functions')
+    parser.add_argument('--memory', action='store_true',
+                        help='trace allocations and report peak memory and retained allocations')
+    parser.add_argument('--top', type=int, default=20,
+                        help='number of functions or allocation sites to report (default 20)')
+    parser.add_argument('--pstats', type=Path, metavar='DIR',
+                        help='with --profile, write the raw statistics of each run to DIR')
+    parser.add_argument('--import-time', action='store_true',
+                        help='report how long it took to import the solution of each day')
+    args = parser.parse_args(arguments)
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.jobs > 1 and (args.profile or args.memory or args.import_time):
+        parser.error('--profile, --memory and --import-time can not be used with --jobs')
+    if args.pstats is not None and not args.profile:
+        parser.error('--pstats needs --profile')
 
-def main() -> None:
     print()
-    time = 0.0
-    match sys.argv:
-        case [_]:
-            try:
-                for day_num in range(1, 26):
-                    day = get_day(day_num)
-                    if day_num == day.day_num:
-                        time += run(day, 1)
-                        time += run(day, 2)
-            except ModuleNotFoundError:
-                pass
-
-        case [_, argument]:
-            time += run_from_string(argument)
+    if args.day is None:
+        tasks = all_tasks()
+    else:
+        tasks = tasks_from_string(args.day)
 
-        case _:
-            raise Exception(f'Usage: python {sys.argv[0]} [day[/part]]')
+    start_time = time.time()
+    if args.profile or args.memory:
+        time_taken = sum(run_profiled(get_day(day_num), parts, args.profile, args.memory,
+                                      args.top, args.pstats)
+                         for day_num, parts in parts_by_day(tasks).items())
+    elif args.jobs == 1:
+        time_taken = sum(run(get_day(day_num), parts)
+                         for day_num, parts in parts_by_day(tasks).items())
+    else:
+        time_taken = run_parallel(tasks, args.jobs)
+    wall_time = time.time() - start_time
+
+    if args.import_time:
+        print()
+        for day_num, import_time in import_times.items():
+            print(f'Day {day_num:02} import: {import_time * 1000:0.2f}ms')
+
+    print(f"\nTotal time: {time_taken:0.3}s")
+    if args.jobs > 1:
+        print(f"Wall time: {wall_time:0.3}s")
 
-    print(f"\nTotal time: {time:0.3}s")
+
+def main() -> None:
+    match sys.argv[1:]:
+        case ['bench', *arguments]:
+            from advent import bench
+            sys.exit(bench.main(arguments))
+        case arguments:
+            run_main(arguments)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,158 @@
+from __future__ import annotations
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass
+import json
+from pathlib import Path
+import statistics
+import time
+
+from typing import Callable, Self
+
+from advent.common import input
+from advent.days import Task, all_tasks, get_day, tasks_from_string
+from advent.days.template import Day, ParsingDay, has_parse
+
+
+@dataclass(slots=True, frozen=True)
+class Statistics:
+    """ Timings of repeated runs of one task, all values in nanoseconds """
+    runs: int
+    min: int
+    median: int
+    p95: int
+
+    @classmethod
+    def create(cls, timings: list[int]) -> Self:
+        timings = sorted(timings)
+        # nearest rank method, so we always report a time that was actually measured
+        p95 = timings[max(0, -(-len(timings) * 95 // 100) - 1)]
+        return cls(len(timings), timings[0], int(statistics.median(timings)), p95)
+
+    @classmethod
+    def from_dict(cls, values: dict[str, int]) -> Self:
+        return cls(values['runs'], values['min'], values['median'], values['p95'])
+
+
+def task_key(task: Task) -> str:
+    day_num, part = task
+    return f'{day_num:02}/{part}'
+
+
+def time_runs(action: Callable[[], object], runs: int, warmup: int) -> Statistics:
+    """ Calls action [warmup] times without taking notes and then [runs] times with timing """
+    for _ in range(warmup):
+        action()
+
+    timings: list[int] = []
+    for _ in range(runs):
+        start_time = time.perf_counter_ns()
+        action()
+        timings.append(time.perf_counter_ns() - start_time)
+    return Statistics.create(timings)
+
+
+def measure(day: Day, part: int, runs: int, warmup: int) -> Statistics:
+    """
+    Measures the given part of a day. The input is read up front, so that only the
+    solution itself is measured. Days with a parse hook get their input parsed once
+    """
+    lines = list(input.read_lines(day.day_num, 'input.txt'))
+    match part:
+        case 1: solver = day.part1
+        case 2: solver = day.part2
+        case _: raise Exception(f'Unknown part {part}')
+
+    if has_parse(day):
+        parsed = day.parse(iter(lines))
+        return time_runs(lambda: solver(parsed), runs, warmup)
+
+    return time_runs(lambda: solver(iter(lines)), runs, warmup)
+
+
+def measure_parse(day: ParsingDay, runs: int, warmup: int) -> Statistics:
+    lines = list(input.read_lines(day.day_num, 'input.txt'))
+    return time_runs(lambda: day.parse(iter(lines)), runs, warmup)
+
+
+def format_ns(value: int) -> str:
+    return f'{value / 1_000_000:0.3f}ms'
+
+
+def format_stats(stats: Statistics) -> str:
+    return (f'min {format_ns(stats.min)} median {format_ns(stats.median)} '
+            f'p95 {format_ns(stats.p95)} ({stats.runs} runs)')
+
+
+def save_baseline(path: Path, results: dict[str, Statistics]):
+    path.write_text(json.dumps({key: asdict(stats) for key, stats in results.items()}, indent=2))
+
+
+def load_baseline(path: Path) -> dict[str, Statistics]:
+    return {key: Statistics.from_dict(values)
+            for key, values in json.loads(path.read_text()).items()}
+
+
+def compare(results: dict[str, Statistics], baseline: dict[str, Statistics],
+            threshold: float) -> list[str]:
+    """
+    Compares the medians with the baseline. Returns the keys of all tasks that got slower
+    by more than the given threshold, which is a fraction of the baseline median
+    """
+    regressions: list[str] = []
+    for key, stats in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f'Day {key}: not in baseline')
+            continue
+
+        change = stats.median / base.median - 1
+        # compared by multiplying, as change is off by rounding for a slowdown of exactly threshold
+        regression = stats.median > base.median * (1 + threshold)
+        status = 'REGRESSION' if regression else 'ok'
+        print(f'Day {key}: {format_ns(base.median)} -> {format_ns(stats.median)} '
+              f'({change:+0.1%}) {status}')
+        if regression:
+            regressions.append(key)
+    return regressions
+
+
+def main(arguments: list[str]) -> int:
+    parser = ArgumentParser(prog='advent bench',
+                            description='Benchmarks the solutions with repeated runs')
+    parser.add_argument('day', nargs='?', help='day[/part] to benchmark, all days if omitted')
+    parser.add_argument('-n', '--runs', type=int, default=10, help='number of timed runs')
+    parser.add_argument('-w', '--warmup', type=int, default=1, help='number of untimed runs')
+    parser.add_argument('--save', type=Path, help='write the results as json baseline')
+    parser.add_argument('--compare', type=Path, help='compare the results to a json baseline')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='slowdown in percent that counts as regression (default 10)')
+    args = parser.parse_args(arguments)
+    if args.runs < 1 or args.warmup < 0:
+        parser.error('need at least one run and no negative warmup')
+
+    tasks = all_tasks() if args.day is None else tasks_from_string(args.day)
+
+    print()
+    results: dict[str, Statistics] = {}
+    for day_num, part in tasks:
+        day = get_day(day_num)
+        if has_parse(day) and f'{day_num:02}/parse' not in results:
+            stats = measure_parse(day, args.runs, args.warmup)
+            results[f'{day_num:02}/parse'] = stats
+            print(f'Day {day_num:02} Parse : {format_stats(stats)}')
+
+        stats = measure(day, part, args.runs, args.warmup)
+        results[task_key((day_num, part))] = stats
+        print(f'Day {day_num:02} Part {part}: {format_stats(stats)}')
+
+    if args.save is not None:
+        save_baseline(args.save, results)
+
+    if args.compare is not None:
+        print()
+        regressions = compare(results, load_baseline(args.compare), args.threshold / 100)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+
+    return 0
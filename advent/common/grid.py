@@ -0,0 +1,112 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from advent.common.position import Position
+
+
+@dataclass(slots=True)
+class Grid:
+    """
+    This class represents a rectangular 2D grid of small integer values (usually characters).
+    The cells are stored row by row in one flat bytearray, so a cell can be addressed by
+    its flat index y * width + x. Hot loops should work on these indices directly.
+    """
+    width: int
+    height: int
+    cells: bytearray
+
+    @classmethod
+    def create(cls, width: int, height: int, fill: int = 0) -> Grid:
+        """ Creates a grid of the given size with all cells set to fill """
+        return cls(width, height, bytearray([fill]) * (width * height))
+
+    @classmethod
+    def parse(cls, lines: Iterable[str], fill: str = ' ') -> Grid:
+        """
+        Creates a grid from lines of ascii text, one character per cell.
+        Lines shorter than the longest one are padded with fill
+        """
+        rows = [line.encode('ascii') for line in lines]
+        width = max((len(row) for row in rows), default=0)
+        padding = fill.encode('ascii')
+        return cls(width, len(rows), bytearray(b''.join(row.ljust(width, padding) for row in rows)))
+
+    def __str__(self) -> str:
+        return '\n'.join(self.row_str(y) for y in range(self.height))
+
+    def copy(self) -> Grid:
+        return Grid(self.width, self.height, self.cells.copy())
+
+    def index(self, x: int, y: int) -> int:
+        """ Returns the flat index of the given coordinates. They are not checked """
+        return y * self.width + x
+
+    def position(self, index: int) -> Position:
+        """ Returns the position of the given flat index """
+        y, x = divmod(index, self.width)
+        return Position(x, y)
+
+    def is_within(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __getitem__(self, position: Position) -> int:
+        if not self.is_within(position.x, position.y):
+            raise IndexError(f"{position} is not within the grid")
+        return self.cells[position.y * self.width + position.x]
+
+    def __setitem__(self, position: Position, value: int):
+        if not self.is_within(position.x, position.y):
+            raise IndexError(f"{position} is not within the grid")
+        self.cells[position.y * self.width + position.x] = value
+
+    def get(self, x: int, y: int, default: int) -> int:
+        """ Returns the value at the given coordinates or default if they are outside the grid """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[y * self.width + x]
+        return default
+
+    def find(self, value: int) -> int | None:
+        """ Returns the flat index of the first cell with the given value """
+        index = self.cells.find(value)
+        return index if index >= 0 else None
+
+    def row(self, y: int) -> bytearray:
+        """ Returns a copy of the given row """
+        return self.cells[y * self.width:(y + 1) * self.width]
+
+    def rows(self, start: int, end: int) -> bytearray:
+        """ Returns a copy of the rows from start up to, but not including, end """
+        return self.cells[start * self.width:end * self.width]
+
+    def row_str(self, y: int) -> str:
+        return self.row(y).decode('ascii')
+
+    def add_rows(self, count: int, fill: int = 0):
+        """ Grows the grid by count rows at the bottom """
+        self.cells.extend(bytes([fill]) * (count * self.width))
+        self.height += count
+
+    def neighbors(self, index: int) -> Iterator[int]:
+        """ Yields the indices of all direct neighbors within the grid: right, up, left, down """
+        x = index % self.width
+        if x + 1 < self.width:
+            yield index + 1
+        if index >= self.width:
+            yield index - self.width
+        if x > 0:
+            yield index - 1
+        if index + self.width < len(self.cells):
+            yield index + self.width
+
+    def wrapped_neighbors(self, index: int) -> Iterator[int]:
+        """
+        Yields the indices of all direct neighbors: right, up, left, down.
+        Neighbors beyond an edge are wrapped around to the opposite edge
+        """
+        size = len(self.cells)
+        row_start = index - index % self.width
+        yield row_start + (index + 1 - row_start) % self.width
+        yield (index - self.width) % size
+        yield row_start + (index - 1 - row_start) % self.width
+        yield (index + self.width) % size
@@ -1,19 +1,87 @@
+from contextlib import contextmanager
+import mmap
+import os
 from pathlib import Path, PurePath
 from typing import Iterator, TypeVar
 
 T = TypeVar('T')
 
+Buffer = bytes | mmap.mmap
+
+# The size of the pieces a mapped file is read in, see line_chunks
+CHUNK_SIZE = 1 << 20
+
+
+def data_path(day: int, file_name: str) -> Path:
+    ''' Returns the path of the mentioned data file of the given day '''
+    return Path.cwd() / PurePath('advent/days/day{0:02}/data'.format(day)) / PurePath(file_name)
+
 
 def read_lines(day: int, file_name: str) -> Iterator[str]:
     '''
     Returns an iterator over the content of the mentioned file
     All lines are striped of an eventual trailing '\n' their
     '''
-    with open(
-        Path.cwd()
-        / PurePath('advent/days/day{0:02}/data'.format(day))
-        / PurePath(file_name),
-        'rt',
-    ) as file:
-        while line := file.readline():
+    with open(data_path(day, file_name), 'rt') as file:
+        for line in file:
             yield line.rstrip('\n')
+
+
+def read_bytes(day: int, file_name: str) -> bytes:
+    ''' Returns the whole content of the mentioned file, read in one go '''
+    return data_path(day, file_name).read_bytes()
+
+
+@contextmanager
+def map_bytes(day: int, file_name: str) -> Iterator[Buffer]:
+    '''
+    Maps the mentioned file into memory and yields it as read only buffer. Like bytes it
+    can be searched with find, or cut into lines with line_chunks, but the file is only read
+    when the buffer is accessed. The buffer is only valid within the with block
+    '''
+    with open(data_path(day, file_name), 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # empty files can not be mapped
+            yield b''
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def line_chunks(data: Buffer, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    '''
+    Yields the data in pieces of about size bytes, each ending with a '\n' (except maybe
+    the last one), so no line is cut in two. Bytes are yielded as a whole, only a mapped
+    file is cut, so it never has to be copied into memory in one go
+    '''
+    if isinstance(data, bytes):
+        yield data
+        return
+
+    start, end = 0, len(data)
+    while start < end:
+        if end - start <= size:
+            stop = end
+        else:
+            stop = data.rfind(b'\n', start, start + size) + 1
+            if stop == 0:
+                # a line longer than size, it is yielded in one piece
+                stop = data.find(b'\n', start + size) + 1 or end
+        yield data[start:stop]
+        start = stop
+
+
+def split_lines(data: Buffer) -> list[bytes]:
+    '''
+    Splits the data into lines, a chunk at a time. Like read_lines the lines do not
+    contain the '\n' and a trailing '\n' at the end of the data does not add an empty line
+    '''
+    lines: list[bytes] = []
+    for chunk in line_chunks(data):
+        pieces = chunk.split(b'\n')
+        # every chunk but the last ends with a '\n'
+        if pieces[-1] == b'':
+            pieces.pop()
+        lines.extend(pieces)
+    return lines
@@ -0,0 +1,22 @@
+import os
+
+_worker_budget: int | None = None
+
+
+def set_worker_budget(count: int) -> None:
+    '''
+    Sets the number of processes a solution may use for its own pools.
+    The runner lowers this if it already runs several days side by side
+    '''
+    global _worker_budget
+    _worker_budget = max(1, count)
+
+
+def worker_budget() -> int:
+    '''
+    Returns the number of processes a solution may use for its own pools.
+    Defaults to the number of cpus if the runner did not set a budget
+    '''
+    if _worker_budget is not None:
+        return _worker_budget
+    return os.cpu_count() or 1
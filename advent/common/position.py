@@ -53,6 +53,15 @@ class Position:
         """ Multiplies all components of this position by the given factor """
         return Position(self.x * factor, self.y * factor)
 
+    def pack(self) -> int:
+        """ Returns this position packed into a single int, see pack """
+        return pack(self.x, self.y)
+
+    @classmethod
+    def unpack(cls, packed: int) -> Position:
+        """ Creates a position from a packed int, see pack """
+        return cls(*unpack(packed))
+
     def right(self) -> Position:
         """ Returns the neighboring position to the right """
         return self + UNIT_X
@@ -145,3 +154,48 @@ UNIT_X = Position(1, 0)
 UNIT_Y = Position(0, 1)
 UNIT_NEG_X = Position(-1, 0)
 UNIT_NEG_Y = Position(0, -1)
+
+
+# Packed coordinates hold x and y in a single int, which is much cheaper to create and to
+# hash than a Position. Both components are stored with an offset in their own PACK_BITS,
+# so adding the packed offsets below to a packed coordinate moves it, as long as no
+# component leaves the range of +/- 2**(PACK_BITS - 1)
+PACK_BITS = 32
+PACK_BIAS = 1 << (PACK_BITS - 1)
+PACK_MASK = (1 << PACK_BITS) - 1
+
+
+def pack(x: int, y: int) -> int:
+    """ Packs the given coordinates into a single int """
+    return ((y + PACK_BIAS) << PACK_BITS) | (x + PACK_BIAS)
+
+
+def unpack(packed: int) -> tuple[int, int]:
+    """ Returns the x and y coordinates of a packed int """
+    return (packed & PACK_MASK) - PACK_BIAS, (packed >> PACK_BITS) - PACK_BIAS
+
+
+def packed_offset(dx: int, dy: int) -> int:
+    """ Returns the value that must be added to a packed coordinate to move it by dx and dy """
+    return (dy << PACK_BITS) + dx
+
+
+PACKED_RIGHT = packed_offset(1, 0)
+PACKED_UP = packed_offset(0, -1)
+PACKED_LEFT = packed_offset(-1, 0)
+PACKED_DOWN = packed_offset(0, 1)
+
+# Same order as Position.unit_neighbors
+PACKED_UNIT_NEIGHBORS = (PACKED_RIGHT, PACKED_UP, PACKED_LEFT, PACKED_DOWN)
+
+# Same order as Position.all_neighbors
+PACKED_ALL_NEIGHBORS = (
+    packed_offset(1, 0),
+    packed_offset(1, -1),
+    packed_offset(0, -1),
+    packed_offset(-1, -1),
+    packed_offset(-1, 0),
+    packed_offset(-1, 1),
+    packed_offset(0, 1),
+    packed_offset(1, 1),
+)
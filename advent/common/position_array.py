@@ -0,0 +1,147 @@
+from __future__ import annotations
+from array import array
+from itertools import repeat
+from operator import add, le, mod, sub
+from typing import Any, Iterable, Iterator, Sequence
+
+from advent.common.position import Position
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+HAS_NUMPY = numpy is not None
+
+Mask = Sequence[bool]
+
+
+class PositionArray:
+    """
+    This class represents many positions in 2D integer space as two arrays of x and y values.
+    All operations work on the whole population at once. The default backend are arrays of
+    the standard library, whose operations loop in C via map. If NumPy is installed it can
+    be used as backend instead by passing use_numpy=True.
+    """
+    __slots__ = ('xs', 'ys', 'use_numpy')
+
+    def __init__(self, xs: Iterable[int], ys: Iterable[int], use_numpy: bool = False):
+        if use_numpy:
+            if numpy is None:
+                raise Exception("NumPy is not installed")
+            self.xs: Any = numpy.fromiter(xs, dtype=numpy.int64)
+            self.ys: Any = numpy.fromiter(ys, dtype=numpy.int64)
+        else:
+            self.xs = xs if isinstance(xs, array) else array('q', xs)
+            self.ys = ys if isinstance(ys, array) else array('q', ys)
+        if len(self.xs) != len(self.ys):
+            raise Exception("x and y values differ in length")
+        self.use_numpy = use_numpy
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[Position],
+                       use_numpy: bool = False) -> PositionArray:
+        positions = list(positions)
+        return cls((pos.x for pos in positions), (pos.y for pos in positions), use_numpy)
+
+    def _create(self, xs: Iterable[int], ys: Iterable[int]) -> PositionArray:
+        """ Creates a new array with the same backend as this one """
+        result = PositionArray.__new__(PositionArray)
+        if self.use_numpy:
+            result.xs, result.ys = xs, ys
+        else:
+            result.xs, result.ys = array('q', xs), array('q', ys)
+        result.use_numpy = self.use_numpy
+        return result
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __iter__(self) -> Iterator[Position]:
+        """ Iterates over all positions. This creates a Position for every item """
+        return map(Position, map(int, self.xs), map(int, self.ys))
+
+    def __getitem__(self, index: int) -> Position:
+        return Position(int(self.xs[index]), int(self.ys[index]))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PositionArray):
+            return False
+        return list(self.xs) == list(other.xs) and list(self.ys) == list(other.ys)
+
+    def __repr__(self) -> str:
+        return f"PositionArray({', '.join(str(pos) for pos in self)})"
+
+    def _combine(self, op: Any, other: Position | PositionArray) -> PositionArray:
+        if self.use_numpy:
+            if isinstance(other, Position):
+                return self._create(op(self.xs, other.x), op(self.ys, other.y))
+            return self._create(op(self.xs, other.xs), op(self.ys, other.ys))
+
+        if isinstance(other, Position):
+            return self._create(map(op, self.xs, repeat(other.x)),
+                                map(op, self.ys, repeat(other.y)))
+        if len(other) != len(self):
+            raise Exception("Position arrays differ in length")
+        return self._create(map(op, self.xs, other.xs), map(op, self.ys, other.ys))
+
+    def __add__(self, other: Position | PositionArray) -> PositionArray:
+        """ Adds a single position to all items, or another array item by item """
+        return self._combine(add, other)
+
+    def __sub__(self, other: Position | PositionArray) -> PositionArray:
+        """ Subtracts a single position from all items, or another array item by item """
+        return self._combine(sub, other)
+
+    def wrap(self, extent: Position) -> PositionArray:
+        """ Wraps all positions into the rectangle from the origin to extent (exclusive) """
+        return self._combine(mod, extent)
+
+    def taxicab_distance(self, other: Position) -> Sequence[int]:
+        """ Returns the taxicab distances of all items to the given position """
+        if self.use_numpy:
+            return abs(self.xs - other.x) + abs(self.ys - other.y)
+        return array('q', map(add,
+                              map(abs, map(sub, self.xs, repeat(other.x))),
+                              map(abs, map(sub, self.ys, repeat(other.y)))))
+
+    def component_min(self) -> Position:
+        """
+        Returns the position with the minimal value for each component
+        Basically this gives the top left corner of the square that
+        includes all positions
+        """
+        if not self:
+            raise Exception("No positions given")
+        return Position(int(min(self.xs)), int(min(self.ys)))
+
+    def component_max(self) -> Position:
+        """
+        Returns the position with the maximum value for each component
+        Basically this gives the bottom right corner of the square that
+        includes all positions
+        """
+        if not self:
+            raise Exception("No positions given")
+        return Position(int(max(self.xs)), int(max(self.ys)))
+
+    def within_distance(self, other: Position, distances: Sequence[int]) -> Mask:
+        """ Returns a mask of all items whose distance to other is at most their given distance """
+        if self.use_numpy:
+            return self.taxicab_distance(other) <= numpy.asarray(distances)
+        return list(map(le, self.taxicab_distance(other), distances))
+
+    def is_within(self, top_left: Position, bottom_right: Position) -> Mask:
+        """ Returns a mask of all items within the rectangle spanned by the given positions """
+        if self.use_numpy:
+            return ((top_left.x <= self.xs) & (self.xs <= bottom_right.x)
+                    & (top_left.y <= self.ys) & (self.ys <= bottom_right.y))
+        return [top_left.x <= x <= bottom_right.x and top_left.y <= y <= bottom_right.y
+                for x, y in zip(self.xs, self.ys)]
+
+    def select(self, mask: Mask) -> PositionArray:
+        """ Returns a new array with all items for which the mask is true """
+        if self.use_numpy:
+            return self._create(self.xs[mask], self.ys[mask])
+        return self._create((x for x, keep in zip(self.xs, mask) if keep),
+                            (y for y, keep in zip(self.ys, mask) if keep))
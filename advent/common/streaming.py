@@ -0,0 +1,21 @@
+from heapq import heappush, heappushpop
+from typing import Iterable
+
+
+def top_k(values: Iterable[int], k: int) -> list[int]:
+    """
+    Returns the k largest values, largest first. The values are consumed as a stream
+    and never more than k of them are kept, in a min heap whose root is the smallest
+    value that is still among the largest
+    """
+    if k < 1:
+        raise Exception(f"k must be positive, got {k}")
+
+    heap: list[int] = []
+    for value in values:
+        if len(heap) < k:
+            heappush(heap, value)
+        elif value > heap[0]:
+            heappushpop(heap, value)
+
+    return sorted(heap, reverse=True)
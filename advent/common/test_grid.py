@@ -0,0 +1,60 @@
+from .grid import Grid
+from .position import Position
+
+
+def test_parse_pads_short_lines():
+    grid = Grid.parse(['ab', 'c'])
+    assert (grid.width, grid.height) == (2, 2)
+    assert str(grid) == 'ab\nc '
+
+
+def test_neighbors_inner():
+    grid = Grid.create(3, 3)
+    expected = [5, 1, 3, 7]
+    result = list(grid.neighbors(4))
+    assert result == expected
+
+
+def test_neighbors_corners():
+    grid = Grid.create(3, 2)
+    assert list(grid.neighbors(0)) == [1, 3]
+    assert list(grid.neighbors(2)) == [1, 5]
+    assert list(grid.neighbors(3)) == [4, 0]
+    assert list(grid.neighbors(5)) == [2, 4]
+
+
+def test_neighbors_single_row_and_column():
+    assert list(Grid.create(3, 1).neighbors(1)) == [2, 0]
+    assert list(Grid.create(1, 3).neighbors(1)) == [0, 2]
+    assert list(Grid.create(1, 1).neighbors(0)) == []
+
+
+def test_wrapped_neighbors_inner():
+    grid = Grid.create(3, 3)
+    expected = list(grid.neighbors(4))
+    result = list(grid.wrapped_neighbors(4))
+    assert result == expected
+
+
+def test_wrapped_neighbors_corners():
+    grid = Grid.create(3, 2)
+    assert list(grid.wrapped_neighbors(0)) == [1, 3, 2, 3]
+    assert list(grid.wrapped_neighbors(2)) == [0, 5, 1, 5]
+    assert list(grid.wrapped_neighbors(3)) == [4, 0, 5, 0]
+    assert list(grid.wrapped_neighbors(5)) == [3, 2, 4, 2]
+
+
+def test_wrapped_neighbors_match_positions():
+    grid = Grid.create(4, 3)
+    for index in range(len(grid.cells)):
+        pos = grid.position(index)
+        expected = [grid.index((pos.x + dx) % grid.width, (pos.y + dy) % grid.height)
+                    for dx, dy in ((1, 0), (0, -1), (-1, 0), (0, 1))]
+        assert list(grid.wrapped_neighbors(index)) == expected
+
+
+def test_index_and_position():
+    grid = Grid.create(4, 3)
+    assert grid.index(3, 2) == 11
+    assert grid.position(11) == Position(3, 2)
+    assert grid.get(4, 0, -1) == -1
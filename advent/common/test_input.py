@@ -0,0 +1,38 @@
+import mmap
+from pathlib import Path
+
+from .input import line_chunks, split_lines
+
+DATA = b'first\n\nthird line\na much longer fourth line\nfifth'
+
+
+def map_file(path: Path, data: bytes) -> mmap.mmap:
+    path.write_bytes(data)
+    with open(path, 'rb') as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def test_split_lines_bytes():
+    assert split_lines(DATA) == DATA.split(b'\n')
+    assert split_lines(DATA + b'\n') == DATA.split(b'\n')
+    assert split_lines(b'') == []
+    assert split_lines(b'\n') == [b'']
+
+
+def test_line_chunks_bytes():
+    assert list(line_chunks(DATA, 4)) == [DATA]
+
+
+def test_line_chunks_mapped(tmp_path: Path):
+    with map_file(tmp_path / 'data.txt', DATA) as data:
+        chunks = list(line_chunks(data, 12))
+    assert b''.join(chunks) == DATA
+    assert all(chunk.endswith(b'\n') for chunk in chunks[:-1])
+    assert chunks == [b'first\n\n', b'third line\n', b'a much longer fourth line\n', b'fifth']
+
+
+def test_split_lines_mapped(tmp_path: Path):
+    for data in (DATA, DATA + b'\n', DATA * 100_000):
+        with map_file(tmp_path / 'data.txt', data) as mapped:
+            result = split_lines(mapped)
+        assert result == split_lines(data)
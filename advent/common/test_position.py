@@ -0,0 +1,34 @@
+from .position import (PACKED_ALL_NEIGHBORS, PACKED_UNIT_NEIGHBORS, Position, pack,
+                       packed_offset, unpack)
+
+
+def test_pack_roundtrip():
+    for x, y in [(0, 0), (-1, 0), (0, -1), (-5, -7), (3, -2), (-(1 << 31), (1 << 31) - 1)]:
+        assert unpack(pack(x, y)) == (x, y)
+        assert Position.unpack(Position(x, y).pack()) == Position(x, y)
+
+
+def test_pack_is_unique():
+    coordinates = [(x, y) for x in range(-3, 4) for y in range(-3, 4)]
+    assert len({pack(x, y) for x, y in coordinates}) == len(coordinates)
+
+
+def test_packed_offset_crosses_zero():
+    packed = pack(0, 0) + packed_offset(-3, -4)
+    assert unpack(packed) == (-3, -4)
+    packed += packed_offset(5, 1)
+    assert unpack(packed) == (2, -3)
+
+
+def test_packed_unit_neighbors():
+    pos = Position(-1, -1)
+    expected = [neighbor.pack() for neighbor in pos.unit_neighbors()]
+    result = [pos.pack() + offset for offset in PACKED_UNIT_NEIGHBORS]
+    assert result == expected
+
+
+def test_packed_all_neighbors():
+    pos = Position(0, -10)
+    expected = [neighbor.pack() for neighbor in pos.all_neighbors()]
+    result = [pos.pack() + offset for offset in PACKED_ALL_NEIGHBORS]
+    assert result == expected
@@ -0,0 +1,93 @@
+import pytest
+
+from .position import Position
+from .position_array import HAS_NUMPY, PositionArray
+
+backends = [False, pytest.param(True, marks=pytest.mark.skipif(not HAS_NUMPY,
+                                                               reason="NumPy is not installed"))]
+
+POSITIONS = [Position(0, 0), Position(3, -2), Position(-4, 5), Position(7, 7)]
+
+
+def create(use_numpy: bool) -> PositionArray:
+    return PositionArray.from_positions(POSITIONS, use_numpy)
+
+
+@pytest.mark.parametrize('use_numpy', backends)
+def test_iterate(use_numpy: bool):
+    array = create(use_numpy)
+    assert len(array) == 4
+    assert list(array) == POSITIONS
+    assert array[2] == Position(-4, 5)
+
+
+@pytest.mark.parametrize('use_numpy', backends)
+def test_add_and_sub(use_numpy: bool):
+    array = create(use_numpy)
+    offset = Position(1, -1)
+    assert list(array + offset) == [pos + offset for pos in POSITIONS]
+    assert list(array - offset) == [pos - offset for pos in POSITIONS]
+    assert list(array + array) == [pos + pos for pos in POSITIONS]
+    assert list(array - array) == [Position(0, 0)] * 4
+
+
+@pytest.mark.parametrize('use_numpy', backends)
+def test_wrap(use_numpy: bool):
+    array = create(use_numpy)
+    expected = [Position(pos.x % 5, pos.y % 4) for pos in POSITIONS]
+    result = list(array.wrap(Position(5, 4)))
+    assert result == expected
+
+
+@pytest.mark.parametrize('use_numpy', backends)
+def test_taxicab_distance(use_numpy: bool):
+    array = create(use_numpy)
+    other = Position(1, 1)
+    expected = [pos.taxicab_distance(other) for pos in POSITIONS]
+    result = [int(distance) for distance in array.taxicab_distance(other)]
+    assert result == expected
+
+
+@pytest.mark.parametrize('use_numpy', backends)
+def test_component_min_max(use_numpy: bool):
+    array = create(use_numpy)
+    assert array.component_min() == Position.component_min(*POSITIONS)
+    assert array.component_max() == Position.component_max(*POSITIONS)
+
+
+@pytest.mark.parametrize('use_numpy', backends)
+def test_within_distance_and_select(use_numpy: bool):
+    array = create(use_numpy)
+    mask = array.within_distance(Position(0, 0), [0, 4, 9, 20])
+    assert [bool(keep) for keep in mask] == [True, False, True, True]
+    assert list(array.select(mask)) == [POSITIONS[0], POSITIONS[2], POSITIONS[3]]
+
+
+@pytest.mark.parametrize('use_numpy', backends)
+def test_is_within(use_numpy: bool):
+    array = create(use_numpy)
+    top_left, bottom_right = Position(-1, -2), Position(7, 5)
+    expected = [pos.is_within(top_left, bottom_right) for pos in POSITIONS]
+    result = [bool(keep) for keep in array.is_within(top_left, bottom_right)]
+    assert result == expected
+
+
+@pytest.mark.parametrize('use_numpy', backends)
+def test_empty(use_numpy: bool):
+    array = PositionArray([], [], use_numpy)
+    assert len(array) == 0
+    with pytest.raises(Exception):
+        array.component_min()
+
+
+def test_length_mismatch():
+    with pytest.raises(Exception):
+        PositionArray([1, 2], [1])
+    with pytest.raises(Exception):
+        create(False) + PositionArray([1], [1])
+
+
+@pytest.mark.skipif(HAS_NUMPY, reason="NumPy is installed")
+def test_numpy_missing():
+    with pytest.raises(Exception):
+        PositionArray([1], [1], use_numpy=True)
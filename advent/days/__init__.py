@@ -0,0 +1,72 @@
+from importlib import import_module
+from pathlib import Path
+import re
+import sys
+import time
+from advent.days.template import Day, is_day
+
+Task = tuple[int, int]
+
+day_pattern = re.compile(r"day(?P<day_num>\d\d)")
+
+# Time it took to import the solution of each day. This includes all modules the
+# solution was the first to import, so the first day pays for the shared ones
+import_times: dict[int, float] = {}
+
+
+def module_name(day_num: int) -> str:
+    return 'advent.days.day{0:02}.solution'.format(day_num)
+
+
+def available_days() -> list[int]:
+    """
+    Returns the numbers of all days that have a solution. The package directory is
+    only scanned, no solution is imported
+    """
+    days: list[int] = []
+    for path in Path(__file__).parent.iterdir():
+        match = day_pattern.fullmatch(path.name)
+        if match is not None and (path / 'solution.py').is_file():
+            days.append(int(match.group('day_num')))
+    return sorted(days)
+
+
+def get_day(day_num: int) -> Day:
+    """ Returns the solution of the given day. It is imported on first use """
+    name = module_name(day_num)
+    if name in sys.modules:
+        day_module = sys.modules[name]
+    else:
+        start_time = time.perf_counter()
+        day_module = import_module(name)
+        import_times[day_num] = time.perf_counter() - start_time
+
+    if not is_day(day_module) or day_module.day_num != day_num:
+        raise Exception(f'Not a valid day: {day_num}')
+
+    return day_module
+
+
+def tasks_from_string(day_str: str) -> list[Task]:
+    """ Returns the (day, part) tasks described by a string like '5' or '5/2' """
+    match day_str.split('/'):
+        case [d]:
+            day_num = int(d)
+            parts = [1, 2]
+
+        case [d, p]:
+            day_num = int(d)
+            parts = [int(p)]
+
+        case _:
+            raise Exception(f'{day_str} is not a valid day description')
+
+    if day_num not in available_days():
+        raise Exception(f'There is no solution for day {day_num}')
+
+    return [(day_num, part) for part in parts]
+
+
+def all_tasks() -> list[Task]:
+    """ Returns the tasks for both parts of all days solved so far """
+    return [(day_num, part) for day_num in available_days() for part in (1, 2)]
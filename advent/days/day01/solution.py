@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from typing import Iterator
 
+from advent.common.input import Buffer
+from advent.common.streaming import top_k
+
 day_num = 1
 
 
@@ -10,7 +13,12 @@ def part1(lines: Iterator[str]) -> int:
 
 
 def part2(lines: Iterator[str]) -> int:
-    return sum(sorted(parse_carried_food(lines))[-3:])
+    return top_calories(parse_carried_food(lines), 3)
+
+
+def top_calories(calories: Iterator[int], count: int) -> int:
+    """ Returns the calories carried by the [count] elves carrying the most """
+    return sum(top_k(calories, count))
 
 
 def parse_carried_food(lines: Iterator[str]) -> Iterator[int]:
@@ -43,3 +51,21 @@ def parse_carried_food(lines: Iterator[str]) -> Iterator[int]:
 
     if calories != 0:
         yield calories
+
+
+def parse_carried_food_bytes(data: Buffer) -> Iterator[int]:
+    """
+    Like parse_carried_food, but works on the raw bytes of the whole input. Each block is
+    found by searching for the next blank line and its numbers are summed by int, which
+    accepts bytes directly, so no str is created for any line.
+    Unlike parse_carried_food several blank lines in a row do not yield an empty elf
+    """
+    start = 0
+    while start < len(data):
+        end = data.find(b'\n\n', start)
+        if end < 0:
+            end = len(data)
+        numbers = data[start:end].split()
+        if numbers:
+            yield sum(map(int, numbers))
+        start = end + 2
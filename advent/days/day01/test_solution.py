@@ -1,6 +1,7 @@
 from advent.common import input
 
-from .solution import day_num, part1, part2
+from .solution import (day_num, parse_carried_food, parse_carried_food_bytes, part1, part2,
+                       top_calories)
 
 
 def test_part1():
@@ -15,3 +16,17 @@ def test_part2():
     expected = 45_000
     result = part2(data)
     assert result == expected
+
+
+def test_part2_bytes():
+    data = input.read_bytes(day_num, 'example01.txt')
+    expected = 45_000
+    result = top_calories(parse_carried_food_bytes(data), 3)
+    assert result == expected
+
+
+def test_parse_bytes_matches_lines():
+    expected = list(parse_carried_food(input.read_lines(day_num, 'example01.txt')))
+    with input.map_bytes(day_num, 'example01.txt') as data:
+        result = list(parse_carried_food_bytes(data))
+    assert result == expected
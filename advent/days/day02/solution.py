@@ -1,18 +1,74 @@
 from __future__ import annotations
 
-from typing import Iterator, Self
+from typing import Callable, Generic, Iterator, Self, TypeVar
 from enum import Enum
 
+from advent.common.input import Buffer, line_chunks, split_lines
+
 day_num = 2
 
+Line = TypeVar('Line', str, bytes)
+
 
 def part1(lines: Iterator[str]) -> int:
-    return sum(player.score(opponent) for opponent, player in (Shape.parse(line) for line in lines))
+    return sum(map(SHAPE_SCORES.__getitem__, lines))
 
 
 def part2(lines: Iterator[str]) -> int:
-    return sum(result.player_shape(opponent).score(opponent)
-               for opponent, result in (Result.parse(line) for line in lines))
+    return sum(map(RESULT_SCORES.__getitem__, lines))
+
+
+def shape_score(line: str) -> int:
+    """ Scores a round where the second column is the shape the player chooses """
+    opponent, player = Shape.parse(line)
+    return player.score(opponent)
+
+
+def result_score(line: str) -> int:
+    """ Scores a round where the second column is the expected result """
+    opponent, result = Result.parse(line)
+    return result.player_shape(opponent).score(opponent)
+
+
+class ScoreTable(dict[Line, int], Generic[Line]):
+    """
+    The precomputed scores of all nine well formed rounds, keyed by the line describing
+    the round, either as str or as raw bytes. Looking up any other line (e.g. with
+    extra whitespace) scores it with the given function, which raises if it is invalid
+    """
+    __slots__ = ('score',)
+
+    def __init__(self, score: Callable[[str], int], rounds: Iterator[Line]):
+        super().__init__((line, score(line if isinstance(line, str) else line.decode()))
+                         for line in rounds)
+        self.score = score
+
+    def __missing__(self, line: Line) -> int:
+        return self.score(line if isinstance(line, str) else line.decode())
+
+
+def score_buffer(data: Buffer, table: ScoreTable[bytes]) -> int:
+    """ Scores all rounds of a whole tournament log, a chunk at a time, see score_chunk """
+    return sum(score_chunk(chunk, table) for chunk in line_chunks(data))
+
+
+def score_chunk(data: bytes, table: ScoreTable[bytes]) -> int:
+    """
+    Scores all rounds of a piece of a tournament log. If every line is a well formed round
+    of four bytes, each kind of round is counted by a single scan of the piece, so no line
+    is touched by Python code at all. Otherwise every line is looked up on its own
+    """
+    size = len(data)
+    if size > 0 and data[-1:] != b'\n':
+        size += 1
+    if size % 4 == 0:
+        counts = {line: data.count(line) for line in table}
+        lines = size // 4
+        # every 4th byte is a newline, so each found round fills a line on its own
+        if sum(counts.values()) == lines and data[3::4].count(b'\n') == len(data) // 4:
+            return sum(table[line] * count for line, count in counts.items())
+
+    return sum(map(table.__getitem__, split_lines(data)))
 
 
 class Shape(Enum):
@@ -193,3 +249,11 @@ class Result(Enum):
             case Result.Lose: return other.prev()
             case Result.Draw: return other
             case Result.Win: return other.next()
+
+
+ROUNDS = [f"{opponent} {player}" for opponent in "ABC" for player in "XYZ"]
+
+SHAPE_SCORES = ScoreTable(shape_score, iter(ROUNDS))
+RESULT_SCORES = ScoreTable(result_score, iter(ROUNDS))
+SHAPE_BYTE_SCORES = ScoreTable(shape_score, (line.encode() for line in ROUNDS))
+RESULT_BYTE_SCORES = ScoreTable(result_score, (line.encode() for line in ROUNDS))
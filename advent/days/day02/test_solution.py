@@ -1,6 +1,7 @@
 from advent.common import input
 
-from .solution import day_num, part1, part2, Shape, Result
+from .solution import (day_num, part1, part2, Shape, Result, score_buffer, score_chunk,
+                       SHAPE_BYTE_SCORES, RESULT_BYTE_SCORES)
 
 
 def test_part1():
@@ -43,3 +44,30 @@ def test_round3():
     expected = 1
     opponent, result = Result.parse(input)
     assert result.player_shape(opponent).score(opponent) == expected
+
+
+def test_score_buffer():
+    data = input.read_bytes(day_num, 'example01.txt')
+    assert score_buffer(data, SHAPE_BYTE_SCORES) == 15
+    assert score_buffer(data, RESULT_BYTE_SCORES) == 12
+
+
+def test_score_buffer_irregular():
+    data = b"A Y\n B  X\nC Z\n"
+    assert score_buffer(data, SHAPE_BYTE_SCORES) == 15
+
+
+def test_score_buffer_mapped():
+    with input.map_bytes(day_num, 'input.txt') as data:
+        result = score_buffer(data, SHAPE_BYTE_SCORES)
+    expected = part1(input.read_lines(day_num, 'input.txt'))
+    assert result == expected
+
+
+
+def test_score_chunk_pieces():
+    data = input.read_bytes(day_num, 'input.txt')
+    expected = score_chunk(data, RESULT_BYTE_SCORES)
+    middle = data.find(b'\n', len(data) // 2) + 1
+    result = sum(score_chunk(piece, RESULT_BYTE_SCORES) for piece in (data[:middle], data[middle:]))
+    assert result == expected
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from functools import reduce
+from operator import and_
+from string import ascii_letters
 from typing import Iterator
 
+from advent.common.input import Buffer, split_lines
+
 day_num = 3
 
 
@@ -14,6 +19,20 @@ def part2(lines: Iterator[str]) -> int:
     return sum(priority(find_common_item(group)) for group in groups)
 
 
+# All items ordered by priority, so that the item of priority p is at index p - 1
+ITEMS = ascii_letters
+
+# Up to this many items per rucksack or compartment, looking up each item with 'in'
+# is faster than building masks. Above it, the quadratic lookups start to hurt
+SHORT_ITEMS = 256
+
+# The bit of every item, keyed by the character as well as by its byte value
+ITEM_BITS: dict[str | int, int] = {
+    **{item: 1 << (index + 1) for index, item in enumerate(ITEMS)},
+    **{ord(item): 1 << (index + 1) for index, item in enumerate(ITEMS)},
+}
+
+
 def priority(char: str) -> int:
     """
     Returns the priority given to each item.
@@ -26,12 +45,43 @@ def priority(char: str) -> int:
     raise Exception(f"Unknown char: {char}")
 
 
+def item_mask(items: str | bytes) -> int:
+    """
+    Returns a mask of the given items, where bit p is set if the item with priority p is
+    among them. Only the distinct items are looked at, of which there are at most 52
+    """
+    try:
+        return sum(map(ITEM_BITS.__getitem__, set(items)))
+    except KeyError as e:
+        raise Exception(f"Unknown item: {e.args[0]!r}")
+
+
+def compartment_masks(rucksack: str | bytes) -> tuple[int, int]:
+    """ Returns the item masks of both compartments of the rucksack """
+    half = len(rucksack) // 2
+    return item_mask(rucksack[:half]), item_mask(rucksack[half:])
+
+
+def common_priority(*masks: int) -> int:
+    """
+    Returns the priority of the item present in all given masks.
+    It is assumed that there is only one such item
+    """
+    common = reduce(and_, masks)
+    if common == 0:
+        raise Exception("No common item found")
+    return common.bit_length() - 1
+
+
 def find_double(rucksack: str) -> str:
     """
     Finds the one item in both compartments.
     It is assumed that there is only one such item
     """
     half = len(rucksack) // 2
+    if half > SHORT_ITEMS:
+        return ITEMS[common_priority(*compartment_masks(rucksack)) - 1]
+
     first = rucksack[:half]
     second = rucksack[half:]
     for item in first:
@@ -45,8 +95,20 @@ def find_common_item(group: tuple[str, str, str]) -> str:
     Finds the one item in all three rucksacks given.
     It is assumed that there is only one such item and group has exactly three rucksacks
     """
+    if max(map(len, group)) > SHORT_ITEMS:
+        return ITEMS[common_priority(*map(item_mask, group)) - 1]
+
     first, second, third = group
     for item in first:
         if item in second and item in third:
             return item
     raise Exception("No common item found")
+
+
+def group_priorities(data: Buffer) -> int:
+    """
+    Returns the sum of the priorities of the common items of all groups of three rucksacks
+    in the given buffer, without decoding any of its lines
+    """
+    masks = map(item_mask, split_lines(data))
+    return sum(common_priority(*group) for group in zip(masks, masks, masks, strict=True))
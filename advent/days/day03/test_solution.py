@@ -1,6 +1,6 @@
 from advent.common import input
 
-from .solution import day_num, part1, part2
+from .solution import day_num, part1, part2, find_common_item, find_double, group_priorities
 
 
 def test_part1():
@@ -15,3 +15,29 @@ def test_part2():
     expected = 70
     result = part2(data)
     assert result == expected
+
+
+def test_find_double():
+    assert find_double("vJrwpWtwJgWrhcsFMMfFFhFp") == 'p'
+
+
+def test_find_common_item():
+    group = ("vJrwpWtwJgWrhcsFMMfFFhFp", "jqHRNqRjqzjGDLGLrsFMfFZSrLrFZsSL", "PmmdzqPrVvPwwTWBwg")
+    assert find_common_item(group) == 'r'
+
+
+def test_group_priorities():
+    data = input.read_bytes(day_num, 'example01.txt')
+    expected = 70
+    result = group_priorities(data)
+    assert result == expected
+
+
+def test_find_double_long():
+    rucksack = 'a' * 300 + 'Z' + 'b' * 300 + 'Z'
+    assert find_double(rucksack) == 'Z'
+
+
+def test_find_common_item_long():
+    group = ('x' * 1000 + 'Q', 'Q' + 'y' * 1000, 'z' * 500 + 'Q' + 'z' * 500)
+    assert find_common_item(group) == 'Q'
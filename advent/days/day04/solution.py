@@ -1,17 +1,34 @@
 from __future__ import annotations
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 
-from typing import Iterator, Self
+from typing import Iterable, Iterator, Self
 
 day_num = 4
 
+# The number of blocks of one level of a RangeIndex that are merged into one block of the next
+FANOUT = 8
+
 
 def part1(lines: Iterator[str]) -> int:
-    return sum(1 for line in lines if Pair.parse(line).includes())
+    return sum(1 for s1, e1, s2, e2 in map(parse_bounds, lines)
+               if (s1 <= s2 and e2 <= e1) or (s2 <= s1 and e1 <= e2))
 
 
 def part2(lines: Iterator[str]) -> int:
-    return sum(1 for line in lines if Pair.parse(line).overlap())
+    return sum(1 for s1, e1, s2, e2 in map(parse_bounds, lines) if s1 <= e2 and s2 <= e1)
+
+
+def parse_bounds(line: str) -> list[int]:
+    """
+    Parses a pair into the plain numbers [start1, end1, start2, end2], without creating
+    any Range or Pair
+    """
+    bounds = line.replace(',', '-').split('-')
+    if len(bounds) != 4:
+        raise Exception(f"Not a valid Pair: {line}")
+    return list(map(int, bounds))
 
 
 @dataclass(slots=True, frozen=True)
@@ -52,3 +69,105 @@ class Pair:
     def overlap(self) -> bool:
         """ Check if the two ranges obverlap """
         return self.first.overlap(self.second)
+
+
+@dataclass(slots=True)
+class RangeIndex:
+    """
+    An index over many ranges that answers which of them overlap, contain or are contained
+    in a given range. The ranges are sorted by start. For their ends a merge sort tree is
+    kept: in levels[k] the ends are sorted within each aligned block of FANOUT^k ranges, so
+    the last level has all ends sorted. Any run of ranges in start order splits into
+    O(log n) blocks, each of which can be searched by bisect. So counting takes O(log² n)
+    at most and listing additionally the time to create the result
+    """
+    ranges: list[Range]
+    starts: array[int]
+    levels: list[array[int]]
+
+    @classmethod
+    def create(cls, ranges: Iterable[Range]) -> RangeIndex:
+        ordered = sorted(ranges, key=lambda item: (item.start, item.end))
+        levels = [array('q', (item.end for item in ordered))]
+        size = 1
+        while size < len(ordered):
+            size *= FANOUT
+            lower, level = levels[-1], array('q')
+            for block in range(0, len(lower), size):
+                # the parts of the block are sorted already, so sorted only has to merge them
+                level.extend(sorted(lower[block:block + size]))
+            levels.append(level)
+        return cls(ordered, array('q', (item.start for item in ordered)), levels)
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def _blocks(self, lo: int, hi: int) -> Iterator[tuple[int, int]]:
+        """ Splits the ranges at positions lo up to hi into aligned blocks (level, start) """
+        level, size = 0, 1
+        while lo < hi:
+            parent_size = size * FANOUT
+            while lo % parent_size and lo < hi:
+                yield level, lo
+                lo += size
+            while hi % parent_size and lo < hi:
+                hi -= size
+                yield level, hi
+            level, size = level + 1, parent_size
+
+    def _count(self, lo: int, hi: int, low_end: int, high_end: int) -> int:
+        """ Counts the ranges at positions lo up to hi whose end is within low_end..high_end """
+        count = 0
+        for level, start in self._blocks(lo, hi):
+            ends, stop = self.levels[level], start + FANOUT ** level
+            count += (bisect_right(ends, high_end, start, stop)
+                      - bisect_left(ends, low_end, start, stop))
+        return count
+
+    def _select(self, lo: int, hi: int, low_end: int, high_end: int) -> Iterator[Range]:
+        """ Yields the ranges at positions lo up to hi whose end is within low_end..high_end """
+        stack = list(self._blocks(lo, hi))
+        while stack:
+            level, start = stack.pop()
+            size = FANOUT ** level
+            ends, last = self.levels[level], start + size - 1
+            if ends[last] < low_end or ends[start] > high_end:
+                continue
+            if low_end <= ends[start] and ends[last] <= high_end:
+                yield from self.ranges[start:last + 1]
+            else:
+                stack.extend((level - 1, child)
+                             for child in range(start, start + size, size // FANOUT))
+
+    def overlapping(self, other: Range) -> Iterator[Range]:
+        """ Yields all ranges that overlap the other """
+        return self._select(0, bisect_right(self.starts, other.end), other.start, self.max_end())
+
+    def count_overlapping(self, other: Range) -> int:
+        """
+        Returns the number of ranges that overlap the other in O(log n): All ranges that
+        start no later than other ends, except those that end before other starts
+        """
+        return bisect_right(self.starts, other.end) - bisect_left(self.levels[-1], other.start)
+
+    def containing(self, other: Range) -> Iterator[Range]:
+        """ Yields all ranges that include the other """
+        return self._select(0, bisect_right(self.starts, other.start), other.end, self.max_end())
+
+    def count_containing(self, other: Range) -> int:
+        """ Returns the number of ranges that include the other """
+        return self._count(0, bisect_right(self.starts, other.start), other.end, self.max_end())
+
+    def contained_in(self, other: Range) -> Iterator[Range]:
+        """ Yields all ranges that are included in the other """
+        return self._select(bisect_left(self.starts, other.start),
+                            bisect_right(self.starts, other.end), other.start, other.end)
+
+    def count_contained_in(self, other: Range) -> int:
+        """ Returns the number of ranges that are included in the other """
+        return self._count(bisect_left(self.starts, other.start),
+                           bisect_right(self.starts, other.end), other.start, other.end)
+
+    def max_end(self) -> int:
+        """ Returns the largest end of all ranges """
+        return self.levels[-1][-1] if self.ranges else 0
@@ -1,6 +1,6 @@
 from advent.common import input
 
-from .solution import Pair, Range, day_num, part1, part2
+from .solution import Pair, Range, RangeIndex, day_num, part1, part2
 
 
 def test_part1():
@@ -22,3 +22,25 @@ def test_parse():
     expected = Pair(Range(2, 4), Range(6, 8))
     result = Pair.parse(input)
     assert result == expected
+
+
+def example_index() -> RangeIndex:
+    pairs = [Pair.parse(line) for line in input.read_lines(day_num, 'example01.txt')]
+    return RangeIndex.create(range for pair in pairs for range in (pair.first, pair.second))
+
+
+def test_index_overlapping():
+    index = example_index()
+    query = Range(5, 5)
+    expected = [Range(2, 6), Range(2, 8), Range(3, 7), Range(4, 5), Range(4, 6), Range(4, 8),
+                Range(5, 7)]
+    assert sorted(index.overlapping(query), key=lambda r: (r.start, r.end)) == expected
+    assert index.count_overlapping(query) == len(expected)
+
+
+def test_index_containment():
+    index = example_index()
+    query = Range(3, 7)
+    assert sorted(index.containing(query), key=lambda r: r.start) == [Range(2, 8), Range(3, 7)]
+    assert index.count_containing(query) == 2
+    assert index.count_contained_in(query) == 5
@@ -32,17 +32,23 @@ class Move:
             case _:
                 raise Exception("Not a valid move")
 
-    def do_move(self, crates: list[str], as_9001: bool) -> list[str]:
+    def do_move(self, crates: list[list[str]], as_9001: bool):
         """
-        Moves the given crates by the provided move. Will fail if there are not enough crates
-        in the stack to take crates off
+        Moves the given crates by the provided move in place. The stacks are lists with
+        their top at the end, so this takes O(amount) no matter how high they are.
+        Will fail if there are not enough crates in the stack to take crates off
         """
+        source = crates[self.frm]
+        start = len(source) - self.amount
+        if start < 0:
+            raise Exception(f"Not enough crates to move {self.amount} from stack {self.frm + 1}")
+
+        moved = source[start:]
+        del source[start:]
         if as_9001:
-            crates[self.to] += crates[self.frm][-self.amount:]
+            crates[self.to].extend(moved)
         else:
-            crates[self.to] += crates[self.frm][-self.amount:][::-1]
-        crates[self.frm] = crates[self.frm][:-self.amount]
-        return crates
+            crates[self.to].extend(reversed(moved))
 
 
 @dataclass(slots=True, frozen=True)
@@ -63,18 +69,19 @@ class Crane:
 
     @classmethod
     def parse_stacks(cls, lines: Iterator[str]) -> list[str]:
-        stacks: list[str] = []
+        # the drawing is read from top to bottom, so the stacks are reversed at the end
+        stacks: list[list[str]] = []
         for line in lines:
             if not line:
-                return stacks
+                return [''.join(reversed(stack)) for stack in stacks]
             crate_row = Crane.parse_crate_row(line)
 
             if len(stacks) < len(crate_row):
-                stacks += [""] * (len(crate_row) - len(stacks))
+                stacks += [[] for _ in range(len(crate_row) - len(stacks))]
 
             for stack_num, crate in enumerate(crate_row):
                 if crate is not None:
-                    stacks[stack_num] = crate + stacks[stack_num]
+                    stacks[stack_num].append(crate)
 
         raise Exception("Can never happen")
 
@@ -90,7 +97,7 @@ class Crane:
         return ''.join(stack[-1] for stack in crates)
 
     def perform_all_moves(self) -> list[str]:
-        stacks = self.stacks
+        stacks = [list(stack) for stack in self.stacks]
         for move in self.moves:
-            stacks = move.do_move(stacks, self.is_9001)
-        return stacks
+            move.do_move(stacks, self.is_9001)
+        return [''.join(stack) for stack in stacks]
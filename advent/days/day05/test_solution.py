@@ -1,3 +1,5 @@
+import pytest
+
 from advent.common import input
 
 from .solution import Move, day_num, part1, part2, Crane
@@ -68,3 +70,10 @@ def test_all_moves9001():
     expected = ["1M", "2C", "3PZND"]
     result = crane.perform_all_moves()
     assert result == expected
+
+
+def test_move_too_many():
+    crates = [["A"], ["B"]]
+    with pytest.raises(Exception):
+        Move(2, 0, 1).do_move(crates, False)
+    assert crates == [["A"], ["B"]]
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from itertools import combinations
-from typing import Iterator
+from typing import Callable, Iterable, Iterator, Sequence
 
 day_num = 6
 
@@ -19,13 +18,67 @@ def marker(line: str, length: int) -> int:
     Returns the position just after a marker. A marker has [length] non repeated characters.
     Raises Exception if no marker was found
     """
-    for pos in range(length, len(line)):
-        found = False
-        for a, b in combinations(line[pos - length:pos], 2):
-            if a == b:
-                found = True
-                break
-        if not found:
-            return pos
+    found = MarkerScanner(length).feed(line)
+    if found is None:
+        raise Exception("No marker found")
+    return found
 
-    raise Exception("No marker found")
+
+class MarkerScanner:
+    """
+    Finds a marker in a datastream that is given piece by piece. For every character the
+    position it was last seen at is kept. The window of non repeated characters ending at
+    the current position starts just after the last repetition, so every character is
+    looked at only once, no matter how long the marker is
+    """
+    __slots__ = ('length', 'last_seen', 'window_start', 'offset')
+
+    def __init__(self, length: int):
+        self.length = length
+        self.last_seen: dict[str | int, int] = {}
+        self.window_start = 0
+        self.offset = 0
+
+    def feed(self, chunk: Sequence[str] | Sequence[int]) -> int | None:
+        """
+        Scans the next chunk of the datastream. Returns the position just after the first
+        marker if it ends within this chunk, counted from the start of the whole datastream
+        """
+        last_seen, window_start, length = self.last_seen, self.window_start, self.length
+        for pos, char in enumerate(chunk, self.offset):
+            seen = last_seen.get(char, -1)
+            if seen >= window_start:
+                window_start = seen + 1
+            last_seen[char] = pos
+            if pos - window_start + 1 == length:
+                self.window_start, self.offset = window_start, pos + 1
+                return pos + 1
+
+        self.window_start, self.offset = window_start, self.offset + len(chunk)
+        return None
+
+
+def read_chunks(read: Callable[[int], bytes], size: int = 65536) -> Iterator[bytes]:
+    """
+    Yields the chunks returned by read until it returns nothing. This works with the read
+    method of a file opened in binary mode as well as with the recv method of a socket
+    """
+    while chunk := read(size):
+        yield chunk
+
+
+def stream_markers(chunks: Iterable[bytes], lengths: Iterable[int]) -> Iterator[tuple[int, int]]:
+    """
+    Yields (length, position just after the marker) for the first marker of each of the
+    given lengths, as soon as the chunk it ends in was read. Only the current chunk is
+    held in memory. Stops when all markers are found or the chunks run out
+    """
+    scanners = [MarkerScanner(length) for length in lengths]
+    for chunk in chunks:
+        for scanner in scanners[:]:
+            found = scanner.feed(chunk)
+            if found is not None:
+                scanners.remove(scanner)
+                yield scanner.length, found
+        if not scanners:
+            return
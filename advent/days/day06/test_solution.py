@@ -1,6 +1,8 @@
+from io import BytesIO
+
 from advent.common import input
 
-from .solution import day_num, marker, part1, part2
+from .solution import day_num, marker, part1, part2, read_chunks, stream_markers
 
 
 def test_part1():
@@ -29,3 +31,17 @@ def test_marker14():
     expected = 19
     result = marker(input, 14)
     assert result == expected
+
+
+def test_marker_at_end():
+    input = "abab" + "cd"
+    expected = 6
+    result = marker(input, 4)
+    assert result == expected
+
+
+def test_stream_markers():
+    source = BytesIO(b"mjqjpqmgbljsphdztnvjfqwrcgsmlb")
+    expected = [(4, 7), (14, 19)]
+    result = list(stream_markers(read_chunks(source.read, 3), [14, 4]))
+    assert result == expected
@@ -1,28 +1,38 @@
 from __future__ import annotations
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
+from itertools import accumulate
 
 from typing import Iterator, Self
 
 day_num = 7
 
 
-def part1(lines: Iterator[str]) -> int:
-    return Directory.parse(lines).get_maxed_size(100_000)
+def parse(lines: Iterator[str]) -> SizeIndex:
+    return SizeIndex.create(Directory.parse(lines))
 
 
-def part2(lines: Iterator[str]) -> int:
-    directory = Directory.parse(lines)
-    return directory.get_min_delete_size(70_000_000, 30_000_000)
+def part1(index: SizeIndex) -> int:
+    return index.total_at_most(100_000)
+
+
+def part2(index: SizeIndex) -> int:
+    return index.min_delete_size(70_000_000, 30_000_000)
 
 
 @dataclass(slots=True, eq=False)
 class Directory:
     name: str
     parent: Directory | None
-    subdirs: list[Directory] = field(default_factory=list, init=False)
-    files: list[tuple[str, int]] = field(default_factory=list, init=False)
+    root: Directory = field(init=False, repr=False)
+    subdirs: dict[str, Directory] = field(default_factory=dict, init=False)
+    files: dict[str, int] = field(default_factory=dict, init=False)
     size: int | None = field(default=None, init=False, repr=False)
 
+    def __post_init__(self):
+        self.root = self if self.parent is None else self.parent.root
+
     @classmethod
     def create_root(cls) -> Self:
         return cls('/', None)
@@ -34,10 +44,7 @@ class Directory:
         """
         match name:
             case '/':
-                current = self
-                while current.parent is not None:
-                    current = current.parent
-                return current
+                return self.root
 
             case '..':
                 if self.parent is None:
@@ -45,54 +52,65 @@ class Directory:
                 return self.parent
 
             case _:
-                for sub in self.subdirs:
-                    if sub.name == name:
-                        return sub
-                raise Exception(f"Could not find subdir {name}")
+                sub = self.subdirs.get(name)
+                if sub is None:
+                    raise Exception(f"Could not find subdir {name}")
+                return sub
 
     def add_directory(self, name: str):
-        """ Adds the named directory."""
-        self.subdirs.append(Directory(name, parent=self))
+        """ Adds the named directory, unless it is already known """
+        if name not in self.subdirs:
+            self.subdirs[name] = Directory(name, parent=self)
 
     def add_file(self, name: str, size: int):
         """ Adds the given file and size """
-        self.files.append((name, size))
+        self.files[name] = size
 
     def get_size(self) -> int:
         """ returns the size of this directory including all subdirectories """
         if self.size is None:
-            self.size = (sum(size for _, size in self.files)
-                         + sum(sub.get_size() for sub in self.subdirs))
+            self.compute_sizes()
+            assert self.size is not None
         return self.size
 
+    def compute_sizes(self) -> array[int]:
+        """
+        Computes the sizes of this directory and all subdirectories without recursion.
+        Returns them as flat array in the order of get_all_directories
+        """
+        sizes = array('q')
+        for dir in self.get_all_directories():
+            # all subdirectories come before their parent, so their sizes are known
+            dir.size = sum(dir.files.values()) + sum(sub.size or 0 for sub in dir.subdirs.values())
+            sizes.append(dir.size)
+        return sizes
+
     def get_all_directories(self) -> Iterator[Directory]:
-        """ Returns an iterator of all subdirectories """
-        for sub in self.subdirs:
-            yield from sub.get_all_directories()
-        yield self
+        """
+        Returns an iterator of all subdirectories and this one. Each directory comes after
+        all of its subdirectories. No recursion is used, so the tree may be arbitrarily deep
+        """
+        pre_order: list[Directory] = []
+        stack = [self]
+        while stack:
+            current = stack.pop()
+            pre_order.append(current)
+            stack.extend(current.subdirs.values())
+        return reversed(pre_order)
 
     def get_maxed_size(self, threshold: int) -> int:
-        """ Returns the sum of all sizes of subdirectories, that are below the given threshold"""
-        return sum(size for size in
-                   (dir.get_size() for dir in self.get_all_directories())
-                   if size <= threshold)
+        """
+        Returns the sum of all sizes of subdirectories, that are below the given threshold.
+        For more than one query create a SizeIndex once and query that instead
+        """
+        return SizeIndex.create(self).total_at_most(threshold)
 
     def get_min_delete_size(self, disk_size: int, space_needed: int) -> int:
         """
         Returns the size of the smallest directory that must be removed to created the free space
         given as a parameter and the given disk size
         """
-        unused = disk_size - self.get_size()
-        minimum: int | None = None
-        for dir in self.get_all_directories():
-            size = dir.get_size()
-            if unused + size >= space_needed and (minimum is None or minimum > size):
-                minimum = size
-
-        if minimum is None:
-            raise Exception("Could not find large enough directory to remove")
-
-        return minimum
+        return SizeIndex.create(self).min_delete_size(disk_size, space_needed)
 
     @classmethod
     def parse(cls, lines: Iterator[str]) -> Self:
@@ -117,3 +135,52 @@ class Directory:
                     raise Exception(f"Could not parse line: {line}")
 
         return root
+
+
+@dataclass(slots=True)
+class SizeIndex:
+    """
+    The sizes of all directories of a tree, sorted so they can be searched by bisect.
+    totals holds the running sums of the sizes, with a leading 0
+    """
+    sizes: array[int]
+    totals: array[int]
+
+    @classmethod
+    def create(cls, directory: Directory) -> Self:
+        sizes = array('q', sorted(directory.compute_sizes()))
+        return cls(sizes, array('q', accumulate(sizes, initial=0)))
+
+    def total_size(self) -> int:
+        """ Returns the size of the directory the index was created for, the largest one """
+        return self.sizes[-1]
+
+    def smallest_at_least(self, size: int) -> int | None:
+        """ Returns the size of the smallest directory of at least the given size """
+        index = bisect_left(self.sizes, size)
+        return self.sizes[index] if index < len(self.sizes) else None
+
+    def largest_at_most(self, size: int) -> int | None:
+        """ Returns the size of the largest directory of at most the given size """
+        index = bisect_right(self.sizes, size)
+        return self.sizes[index - 1] if index > 0 else None
+
+    def count_at_most(self, size: int) -> int:
+        """ Returns the number of directories of at most the given size """
+        return bisect_right(self.sizes, size)
+
+    def total_at_most(self, size: int) -> int:
+        """ Returns the sum of the sizes of all directories of at most the given size """
+        return self.totals[bisect_right(self.sizes, size)]
+
+    def min_delete_size(self, disk_size: int, space_needed: int) -> int:
+        """
+        Returns the size of the smallest directory that must be removed to created the free space
+        given as a parameter and the given disk size
+        """
+        unused = disk_size - self.total_size()
+        minimum = self.smallest_at_least(space_needed - unused)
+        if minimum is None:
+            raise Exception("Could not find large enough directory to remove")
+
+        return minimum
@@ -1,19 +1,19 @@
 from advent.common import input
 
-from .solution import day_num, part1, part2, Directory
+from .solution import day_num, parse, part1, part2, Directory, SizeIndex
 
 
 def test_part1():
     data = input.read_lines(day_num, 'example01.txt')
     expected = 95437
-    result = part1(data)
+    result = part1(parse(data))
     assert result == expected
 
 
 def test_part2():
     data = input.read_lines(day_num, 'example01.txt')
     expected = 24933642
-    result = part2(data)
+    result = part2(parse(data))
     assert result == expected
 
 
@@ -39,3 +39,23 @@ def test_find_to_delete():
     directory = Directory.parse(data)
     result = directory.get_min_delete_size(70_000_000, 30_000_000)
     assert result == expected
+
+
+def test_size_index():
+    data = input.read_lines(day_num, 'example01.txt')
+    index = SizeIndex.create(Directory.parse(data))
+    assert index.smallest_at_least(8_381_165) == 24_933_642
+    assert index.largest_at_most(100_000) == 94_853
+    assert index.count_at_most(100_000) == 2
+    assert index.smallest_at_least(50_000_000) is None
+    assert index.total_at_most(100_000) == 95_437
+    assert index.total_at_most(0) == 0
+    assert index.total_size() == 48_381_165
+
+
+def test_deep_tree():
+    depth = 10_000
+    lines = [line for n in range(depth) for line in (f'dir d{n}', f'$ cd d{n}', '1 file')]
+    directory = Directory.parse(iter(lines))
+    assert directory.get_size() == depth
+    assert directory.cd_into('d0').cd_into('/') is directory
@@ -1,99 +1,129 @@
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass
 
-from typing import Iterator, Self
+from typing import Iterable, Iterator, Self
+
+from advent.common.grid import Grid
 
 day_num = 8
 
+# Maps the digits of the input to the heights 0 to 9
+HEIGHTS = bytes.maketrans(b'0123456789', bytes(range(10)))
+
+
+def parse(lines: Iterator[str]) -> Scan:
+    return Forest.parse(lines).scan()
+
+
+def part1(scan: Scan) -> int:
+    return scan.count_visible_trees()
 
-def part1(lines: Iterator[str]) -> int:
-    return Forest.parse(lines).count_visible_trees()
 
+def part2(scan: Scan) -> int:
+    return scan.max_scenic_score()
 
-def part2(lines: Iterator[str]) -> int:
-    return Forest.parse(lines).max_scenic_score()
+
+@dataclass(slots=True, frozen=True)
+class Scan:
+    """ The trees visible from outside and the scenic scores of all trees of a forest """
+    visible: bytearray
+    scores: array[int]
+
+    def count_visible_trees(self) -> int:
+        return self.visible.count(1)
+
+    def max_scenic_score(self) -> int:
+        return max(self.scores)
 
 
 @dataclass(slots=True)
 class Forest:
-    trees: list[list[int]]
-    width: int
-    height: int
+    trees: Grid
 
     @classmethod
     def parse(cls, lines: Iterator[str]) -> Self:
-        trees = [[int(tree) for tree in line] for line in lines]
-        return cls(trees, len(trees[0]), len(trees))
+        trees = Grid.parse(lines)
+        if not trees.cells.isdigit():
+            raise Exception("Forest contains something else than trees")
+        trees.cells = trees.cells.translate(HEIGHTS)
+        return cls(trees)
+
+    @property
+    def width(self) -> int:
+        return self.trees.width
+
+    @property
+    def height(self) -> int:
+        return self.trees.height
+
+    def lines_of_sight(self) -> Iterator[range]:
+        """
+        Yields every row and column in both directions, as ranges of flat indices
+        starting at the edge the trees are looked at from
+        """
+        width, size = self.width, len(self.trees.cells)
+        for start in range(0, size, width):
+            yield range(start, start + width)
+            yield range(start + width - 1, start - 1, -1)
+        for x in range(width):
+            yield range(x, size, width)
+            yield range(size - width + x, x - width, -width)
+
+    def scan(self) -> Scan:
+        """
+        Returns a map of the trees visible from outside and the scenic score of all trees.
+        Each line of sight is passed once with a stack of the trees that can still block
+        the view. Its heights decrease strictly, so it never holds more than ten trees
+        """
+        cells = self.trees.cells
+        visible = bytearray(len(cells))
+        scores = array('q', [1]) * len(cells)
+        self.scan_trees(self.lines_of_sight(), cells, visible, scores)
+        return Scan(visible, scores)
+
+    @staticmethod
+    def scan_trees(lines: Iterable[range], cells: bytearray, visible: bytearray,
+                   scores: array[int]):
+        for line in lines:
+            heights: list[int] = []
+            steps: list[int] = []
+            for step, index in enumerate(line):
+                height = cells[index]
+                while heights and heights[-1] < height:
+                    heights.pop()
+                    steps.pop()
+
+                if heights:
+                    scores[index] *= step - steps[-1]
+                    if heights[-1] == height:
+                        heights.pop()
+                        steps.pop()
+                else:
+                    # nothing blocks the view to the edge
+                    scores[index] *= step
+                    visible[index] = 1
+
+                heights.append(height)
+                steps.append(step)
 
     def count_visible_trees(self) -> int:
-        visible: set[tuple[int, int]] = set()
-
-        # From Above
-        mx = self.trees[0].copy()
-        for y in range(1, self.height - 1):
-            for x in range(1, self.width - 1):
-                if self.trees[y][x] > mx[x]:
-                    mx[x] = self.trees[y][x]
-                    visible.add((x, y))
-
-        # From Below
-        mx = self.trees[-1].copy()
-        for y in range(self.height - 2, 0, -1):
-            for x in range(1, self.width - 1):
-                if self.trees[y][x] > mx[x]:
-                    mx[x] = self.trees[y][x]
-                    visible.add((x, y))
-
-        # From Left
-        mx = [row[0] for row in self.trees]
-        for x in range(1, self.width - 1):
-            for y in range(1, self.height - 1):
-                if self.trees[y][x] > mx[y]:
-                    mx[y] = self.trees[y][x]
-                    visible.add((x, y))
-
-        # From Right
-        mx = [row[-1] for row in self.trees]
-        for x in range(self.width - 2, 0, -1):
-            for y in range(1, self.height - 1):
-                if self.trees[y][x] > mx[y]:
-                    mx[y] = self.trees[y][x]
-                    visible.add((x, y))
-
-        return len(visible) + 2 * (self.width + self.height - 2)
+        return self.scan().count_visible_trees()
 
     def max_scenic_score(self) -> int:
-        max_score = 0
-        for y in range(1, self.height - 1):
-            for x in range(1, self.width - 1):
-                score = self.single_scenic_score(x, y)
-                if score > max_score:
-                    max_score = score
-        return max_score
+        return self.scan().max_scenic_score()
 
     def single_scenic_score(self, x: int, y: int) -> int:
-        up = 0
-        for dy in range(y - 1, -1, -1):
-            up += 1
-            if self.trees[dy][x] >= self.trees[y][x]:
-                break
-
-        down = 0
-        for dy in range(y + 1, self.height):
-            down += 1
-            if self.trees[dy][x] >= self.trees[y][x]:
-                break
-
-        left = 0
-        for dx in range(x - 1, -1, -1):
-            left += 1
-            if self.trees[y][dx] >= self.trees[y][x]:
-                break
-
-        right = 0
-        for dx in range(x + 1, self.width):
-            right += 1
-            if self.trees[y][dx] >= self.trees[y][x]:
-                break
-
-        return up * down * left * right
+        """ Returns the scenic score of a single tree by looking from it in all directions """
+        cells, width = self.trees.cells, self.width
+        index = self.trees.index(x, y)
+        score = 1
+        for line in (range(index - width, -1, -width), range(index + width, len(cells), width),
+                     range(index - 1, index - x - 1, -1), range(index + 1, index - x + width)):
+            distance = 0
+            for other in line:
+                distance += 1
+                if cells[other] >= cells[index]:
+                    break
+            score *= distance
+        return score
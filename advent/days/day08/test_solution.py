@@ -1,19 +1,19 @@
 from advent.common import input
 
-from .solution import Forest, day_num, part1, part2
+from .solution import Forest, day_num, parse, part1, part2
 
 
 def test_part1():
     data = input.read_lines(day_num, 'example01.txt')
     expected = 21
-    result = part1(data)
+    result = part1(parse(data))
     assert result == expected
 
 
 def test_part2():
     data = input.read_lines(day_num, 'example01.txt')
     expected = 8
-    result = part2(data)
+    result = part2(parse(data))
     assert result == expected
 
 
@@ -43,3 +43,12 @@ def test_max_distance():
     expected = 8
     result = Forest.parse(data).max_scenic_score()
     assert result == expected
+
+
+def test_scan_matches_single_scores():
+    data = input.read_lines(day_num, 'example01.txt')
+    forest = Forest.parse(data)
+    scores = forest.scan().scores
+    expected = [forest.single_scenic_score(x, y)
+                for y in range(forest.height) for x in range(forest.width)]
+    assert list(scores) == expected
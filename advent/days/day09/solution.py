@@ -1,7 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
 
-from typing import Iterator, Self
+from typing import Iterable, Iterator, Self
+
+from advent.common.position import pack, packed_offset
 
 day_num = 9
 
@@ -75,19 +77,50 @@ class Command:
                 raise Exception(f"Illegal line: {line}")
 
 
-def simulate(lst: Iterator[Command], rope_length: int) -> int:
-    """ Walks the whole rope in Planck length steps according to commands """
-    rope = [Point(0, 0)] * rope_length
-    visited = {rope[-1]}
+def simulate(lst: Iterable[Command], rope_length: int) -> int:
+    """
+    Walks the whole rope according to commands and returns the number of positions the
+    tail visited. The knots are kept as plain ints in the lists xs and ys, the visited
+    positions as packed ints. Once every knot trails the one before it by exactly one step
+    in the direction of the command, the rope moves as a whole, so the rest of the command
+    is done in one jump
+    """
+    xs = [0] * rope_length
+    ys = [0] * rope_length
+    last = rope_length - 1
+    visited = {pack(0, 0)}
     for command in lst:
-        for _ in range(command.steps):
-            rope[0] = rope[0].add(command.dir)
+        dx, dy = command.dir.x, command.dir.y
+        remaining = command.steps
+        tail_moved = True
+        while remaining > 0:
+            if tail_moved and is_straight(xs, ys, dx, dy):
+                tail = pack(xs[last], ys[last])
+                offset = packed_offset(dx, dy)
+                visited.update(range(tail + offset, tail + (remaining + 1) * offset, offset))
+                for n in range(rope_length):
+                    xs[n] += remaining * dx
+                    ys[n] += remaining * dy
+                break
+
+            remaining -= 1
+            xs[0] += dx
+            ys[0] += dy
+            tail_moved = False
             for n in range(1, rope_length):
-                moved_piece = rope[n].step_to(rope[n - 1])
-                if not moved_piece:
+                diff_x = xs[n - 1] - xs[n]
+                diff_y = ys[n - 1] - ys[n]
+                if -1 <= diff_x <= 1 and -1 <= diff_y <= 1:
                     break
-                rope[n] = moved_piece
-                if n == rope_length - 1:
-                    visited.add(rope[n])
+                xs[n] += (diff_x > 0) - (diff_x < 0)
+                ys[n] += (diff_y > 0) - (diff_y < 0)
+            else:
+                tail_moved = True
+                visited.add(pack(xs[last], ys[last]))
 
     return len(visited)
+
+
+def is_straight(xs: list[int], ys: list[int], dx: int, dy: int) -> bool:
+    """ Checks if each knot is exactly one step of (dx, dy) behind the one before it """
+    return all(xs[n - 1] - xs[n] == dx and ys[n - 1] - ys[n] == dy for n in range(1, len(xs)))
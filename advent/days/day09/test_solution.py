@@ -1,6 +1,8 @@
+import pytest
+
 from advent.common import input
 
-from .solution import Command, day_num, part1, part2, simulate
+from .solution import Command, Point, day_num, part1, part2, simulate
 
 
 def test_part1():
@@ -39,3 +41,58 @@ def test_long2():
     lst = (Command.parse(line) for line in data)
     result = simulate(lst, 10)
     assert result == expected
+
+
+def simulate_step_by_step(commands: list[Command], rope_length: int) -> int:
+    """ Moves the rope one step at a time, to compare the jumps of simulate against """
+    rope = [Point(0, 0)] * rope_length
+    visited = {rope[-1]}
+    for command in commands:
+        for _ in range(command.steps):
+            rope[0] = rope[0].add(command.dir)
+            for n in range(1, rope_length):
+                step = rope[n].step_to(rope[n - 1])
+                if step is None:
+                    break
+                rope[n] = step
+            visited.add(rope[-1])
+    return len(visited)
+
+
+@pytest.mark.parametrize('rope_length', [2, 10])
+def test_matches_step_by_step(rope_length: int):
+    lines = ['R 5', 'U 8', 'L 3000', 'D 2500', 'R 12', 'U 1', 'R 4000', 'U 3000',
+             'L 1', 'D 1', 'R 2', 'D 6000', 'L 7', 'U 2']
+    commands = [Command.parse(line) for line in lines]
+    expected = simulate_step_by_step(commands, rope_length)
+    result = simulate(commands, rope_length)
+    assert result == expected
+
+
+@pytest.mark.parametrize('rope_length', [2, 10])
+@pytest.mark.parametrize('direction', 'UDLR')
+def test_long_command(direction: str, rope_length: int):
+    # the tail follows the head on a straight line, but stays rope_length - 1 behind
+    expected = 1_000_000 - rope_length + 2
+    result = simulate([Command.parse(f'{direction} 1000000')], rope_length)
+    assert result == expected
+
+
+@pytest.mark.parametrize('rope_length', [2, 10])
+@pytest.mark.parametrize('there, back', [('R', 'L'), ('L', 'R'), ('U', 'D'), ('D', 'U')])
+def test_long_command_and_back(there: str, back: str, rope_length: int):
+    # going back twice as far crosses the start, so the tail covers both signs
+    expected = 2 * (100_000 - rope_length + 1) + 1
+    commands = [Command.parse(f'{there} 100000'), Command.parse(f'{back} 200000')]
+    result = simulate(commands, rope_length)
+    assert result == expected
+
+
+@pytest.mark.parametrize('rope_length', [2, 10])
+@pytest.mark.parametrize('direction', 'UDLR')
+def test_long_command_matches_step_by_step(direction: str, rope_length: int):
+    commands = [Command.parse('U 1'), Command.parse('R 1'),
+                Command.parse(f'{direction} 20000')]
+    expected = simulate_step_by_step(commands, rope_length)
+    result = simulate(commands, rope_length)
+    assert result == expected
@@ -1,19 +1,29 @@
 from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from itertools import accumulate
 
-from typing import Iterator
+from typing import Iterable, Iterator, Self
 
 day_num = 10
 
+# The cycles during which the signal strength is measured
+SIGNAL_CYCLES = range(20, 221, 40)
 
-def part1(lines: Iterator[str]) -> int:
-    return sum(grab_values(lines))
 
+def parse(lines: Iterator[str]) -> Trace:
+    return Trace.compile(lines)
 
-def part2(lines: Iterator[str]) -> list[str]:
-    return draw(lines, 40, 6)
 
+def part1(trace: Trace) -> int:
+    return sum(trace.signal_strengths(SIGNAL_CYCLES))
 
-def parse(line: str) -> None | int:
+
+def part2(trace: Trace) -> list[str]:
+    return trace.render(40, 6)
+
+
+def parse_instruction(line: str) -> None | int:
     """
     Parses the a line into the two possible instructions.
     May raise if the instructions was invalid
@@ -27,37 +37,66 @@ def parse(line: str) -> None | int:
             raise Exception(f"Unknown line: {line}")
 
 
+@dataclass(slots=True)
+class Trace:
+    """
+    The value of the register during every cycle of a program. registers[n] is the value
+    during cycle n + 1, the last item is the value after the program has finished
+    """
+    registers: array[int]
+
+    @classmethod
+    def compile(cls, lines: Iterable[str]) -> Self:
+        """
+        Runs the program once. Each cycle adds a delta to the register: noop adds 0,
+        addx adds 0 and then its value. The prefix sums of the deltas are the values
+        """
+        deltas = array('q', [1])
+        for line in lines:
+            match parse_instruction(line):
+                case None:
+                    deltas.append(0)
+                case value:
+                    deltas.append(0)
+                    deltas.append(value)
+        return cls(array('q', accumulate(deltas)))
+
+    def __len__(self) -> int:
+        return len(self.registers)
+
+    def value_during(self, cycle: int) -> int:
+        """ Returns the value of the register during the given cycle, counted from 1 """
+        if not 1 <= cycle <= len(self.registers):
+            raise Exception(f"Cycle {cycle} is not part of the program")
+        return self.registers[cycle - 1]
+
+    def signal_strengths(self, cycles: Iterable[int]) -> list[int]:
+        """ Returns the signal strength during each of the given cycles """
+        return [cycle * self.value_during(cycle) for cycle in cycles]
+
+    def render(self, width: int, height: int) -> list[str]:
+        """
+        Returns the rows the CRT draws. A pixel is lit if the sprite, which is three pixels
+        wide and centered at the register, covers it
+        """
+        rows: list[str] = []
+        for start in range(0, min(width * height, len(self.registers)), width):
+            sprites = self.registers[start:start + width]
+            rows.append(''.join('#' if -1 <= sprite - pos <= 1 else ' '
+                                for pos, sprite in enumerate(sprites)))
+        return rows
+
+
 def cycles(lines: Iterator[str]) -> Iterator[int]:
     """
     Cycles through the instructions and yields a new value for each cycle
     """
-    register = 1
-    for line in lines:
-        yield register
-        match parse(line):
-            case None:
-                pass
-            case value:
-                yield register
-                register += value
-    yield register
+    return iter(Trace.compile(lines).registers)
 
 
 def grab_values(lines: Iterator[str]) -> Iterator[int]:
-    for cycle, value in enumerate(cycles(lines), start=1):
-        if cycle in [20, 60, 100, 140, 180, 220]:
-            yield cycle * value
+    return iter(Trace.compile(lines).signal_strengths(SIGNAL_CYCLES))
 
 
 def draw(lines: Iterator[str], width: int, height: int) -> list[str]:
-    picture = ""
-    for cycle, sprite in enumerate(cycles(lines)):
-        crt_pos = cycle % width
-        if sprite - 1 <= crt_pos <= sprite + 1:
-            picture += '#'
-        else:
-            picture += ' '
-
-        if crt_pos == width - 1:
-            picture += '\n'
-    return picture.split('\n')[:height]
+    return Trace.compile(lines).render(width, height)
@@ -1,19 +1,19 @@
 from advent.common import input
 
-from .solution import cycles, day_num, draw, grab_values, part1, part2
+from .solution import Trace, cycles, day_num, draw, grab_values, parse, part1, part2
 
 
 def test_part1():
     lines = input.read_lines(day_num, 'example01.txt')
     expected = 13140
-    result = part1(lines)
+    result = part1(parse(lines))
     assert result == expected
 
 
 def test_part2():
     lines = input.read_lines(day_num, 'example01.txt')
     expected = list(input.read_lines(day_num, 'expected01.txt'))
-    result = part2(lines)
+    result = part2(parse(lines))
     assert result == expected
 
 
@@ -36,3 +36,18 @@ def test_draw():
     expected = list(input.read_lines(day_num, 'expected01.txt'))
     result = draw(lines, 40, 6)
     assert result == expected
+
+
+def test_value_during():
+    trace = Trace.compile(input.read_lines(day_num, 'example02.txt'))
+    assert trace.value_during(1) == 1
+    assert trace.value_during(4) == 4
+    assert trace.value_during(6) == -1
+    assert trace.signal_strengths([2, 5]) == [2, 20]
+
+
+def test_render_other_size():
+    trace = Trace.compile(input.read_lines(day_num, 'example01.txt'))
+    expected = [row[:20] for row in trace.render(40, 6)[:3:2]]
+    result = trace.render(20, 6)[:6:4]
+    assert result == expected
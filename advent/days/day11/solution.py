@@ -1,11 +1,15 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from array import array
 from dataclasses import dataclass, field
+from functools import partial
 from math import prod
 import re
 
 from typing import Callable, Iterator, Self
 
+from advent.common import parallel
+
 day_num = 11
 
 
@@ -23,6 +27,23 @@ def part2(lines: Iterator[str]) -> int:
 
 WorryIncreaser = Callable[[int], int]
 
+# An item is the monkey holding it at the start of a round and its worry level
+ItemState = tuple[int, int]
+
+
+@dataclass(slots=True, frozen=True)
+class Operation:
+    """ The worry increaser of a monkey. Unlike a lambda it can be sent to other processes """
+    operator: str
+    operand: int
+
+    def __call__(self, old: int) -> int:
+        match self.operator:
+            case '**': return old ** self.operand
+            case '*': return old * self.operand
+            case '+': return old + self.operand
+            case _: raise Exception(f"Unknown operator: {self.operator}")
+
 
 def match_raise(pattern: str, string: str) -> re.Match[str]:
     result = re.match(pattern, string)
@@ -50,13 +71,11 @@ class Monkey:
         s_operation = next(lines).split('=')
         match s_operation[1].split():
             case ['old', '*', 'old']:
-                operation: WorryIncreaser = lambda old: old ** 2
+                operation = Operation('**', 2)
             case ['old', '*', num]:
-                number = int(num)
-                operation: WorryIncreaser = lambda old: old * number
+                operation = Operation('*', int(num))
             case ['old', '+', num]:
-                number = int(num)
-                operation: WorryIncreaser = lambda old: old + number
+                operation = Operation('+', int(num))
             case _: raise Exception("Illegal operation")
         s_modulo = next(lines).split("by")
         modulo = int(s_modulo[1].strip())
@@ -85,6 +104,12 @@ class Monkey:
     def catch_item(self, item: int):
         self.items.append(item)
 
+    def throw_target(self, worry: int) -> int:
+        """ Returns the monkey an item with the given (already increased) worry is thrown to """
+        if worry % self.modulator == 0:
+            return self.target_if_divides
+        return self.catcher_if_not_divides
+
 
 @dataclass(slots=True)
 class Troop(ABC):
@@ -137,3 +162,70 @@ class Troop_While_Kinda_Relieved(Troop):
         for current_monkey in self.monkeys:
             for target_monkey, item in current_monkey.inspect_items(None):
                 self.monkeys[target_monkey].catch_item(item % self.modulator)
+
+    def rounds(self, count: int, workers: int = 1):
+        """
+        Follows every item on its own for count rounds, see follow_item. With more than one
+        worker the items are followed in parallel processes, but never in more than the
+        worker budget allows. Afterwards the items a monkey holds are ordered by the monkey
+        that held them at the start, not by when it caught them
+        """
+        starts = [(number, item) for number, monkey in enumerate(self.monkeys)
+                  for item in monkey.items]
+        follow = partial(follow_item, self.monkeys, self.modulator, count=count)
+        workers = min(workers, parallel.worker_budget())
+        if workers > 1:
+            # imported here, as it pulls in multiprocessing, which a single worker does not need
+            from multiprocessing import Pool
+
+            with Pool(workers) as pool:
+                results = pool.map(follow, starts)
+        else:
+            results = list(map(follow, starts))
+
+        for monkey in self.monkeys:
+            monkey.items.clear()
+        for inspections, (number, worry) in results:
+            for monkey, inspected in zip(self.monkeys, inspections):
+                monkey.inspected += inspected
+            self.monkeys[number].catch_item(worry)
+
+
+def follow_item(monkeys: list[Monkey], modulator: int, start: ItemState,
+                count: int) -> tuple[list[int], ItemState]:
+    """
+    Follows a single item for count rounds, while no worry is relieved. Returns how often
+    each monkey inspected it and where it ends up. Once the item is back in a state it had
+    at the start of an earlier round, the remaining rounds are extrapolated from that cycle
+    """
+    # the monkeys inspecting the item, in order, and where each round starts in there
+    inspections = array('q')
+    round_starts = array('q')
+    states: dict[ItemState, int] = {}
+
+    number, worry = start[0], start[1] % modulator
+    while len(round_starts) < count and (number, worry) not in states:
+        states[number, worry] = len(round_starts)
+        round_starts.append(len(inspections))
+        while True:
+            inspections.append(number)
+            monkey = monkeys[number]
+            worry = monkey.worry_increaser(worry) % modulator
+            target = monkey.throw_target(worry)
+            if target <= number:
+                break
+            number = target
+        number = target
+    round_starts.append(len(inspections))
+
+    if len(round_starts) - 1 == count:
+        return [inspections.count(monkey) for monkey in range(len(monkeys))], (number, worry)
+
+    first = states[number, worry]
+    length = len(round_starts) - 1 - first
+    cycles, rest = divmod(count - first, length)
+    cycle = inspections[round_starts[first]:]
+    remaining = inspections[:round_starts[first + rest]]
+    result = [cycles * cycle.count(monkey) + remaining.count(monkey)
+              for monkey in range(len(monkeys))]
+    return result, list(states)[first + rest]
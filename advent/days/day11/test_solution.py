@@ -54,3 +54,23 @@ def test_inspected2():
     result = Troop_While_Kinda_Relieved.parse(lines)
     result.rounds(10_000)
     assert result.inspected_result() == expected
+
+
+def test_rounds_extrapolated():
+    lines = list(input.read_lines(day_num, 'example01.txt'))
+    simulated = Troop_While_Kinda_Relieved.parse(iter(lines))
+    for _ in range(1_000):
+        simulated.single_round()
+    result = Troop_While_Kinda_Relieved.parse(iter(lines))
+    result.rounds(1_000)
+    assert [monkey.inspected for monkey in result.monkeys] == [
+        monkey.inspected for monkey in simulated.monkeys]
+
+
+def test_many_rounds_in_parallel():
+    lines = list(input.read_lines(day_num, 'example01.txt'))
+    sequential = Troop_While_Kinda_Relieved.parse(iter(lines))
+    sequential.rounds(1_000_000_000)
+    parallel = Troop_While_Kinda_Relieved.parse(iter(lines))
+    parallel.rounds(1_000_000_000, workers=2)
+    assert parallel.inspected_result() == sequential.inspected_result()
@@ -1,33 +1,67 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from queue import Queue
+from array import array
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from math import inf
 
-from typing import Iterator, Self
+from typing import Iterable, Iterator, Self
 
-from advent.common.position import ORIGIN, Position
+from advent.common.grid import Grid
+from advent.common.position import Position
 
 day_num = 12
 
 
-def part1(lines: Iterator[str]) -> int:
-    return Map.create(lines).find_path('S')
+def parse(lines: Iterator[str]) -> DistanceField:
+    return DistanceField.create(Map.create(lines))
 
 
-def part2(lines: Iterator[str]) -> int:
-    return Map.create(lines).find_path('a')
+def part1(distances: DistanceField) -> int:
+    return distances.shortest_from('S')
+
+
+def part2(distances: DistanceField) -> int:
+    return distances.shortest_from('a')
 
 
 @dataclass(slots=True, frozen=True)
+class Route:
+    """ The result of a search between two points """
+    length: int
+    expanded: int
+    path: list[Position] | None = None
+
+
+# The bits of the directions in the step masks of a Map, in the order of Grid.neighbors
+RIGHT, UP, LEFT, DOWN = 1, 2, 4, 8
+
+
+@dataclass(slots=True)
 class Map:
-    map: list[str]
-    bottom_right: Position
+    """
+    climbs holds a mask for each cell with the directions one can climb to from there,
+    descents the directions one could have climbed from. moves maps a mask to the offsets
+    of its directions
+    """
+    map: Grid
+    heights: bytearray
+    climbs: bytearray = field(init=False, repr=False)
+    descents: bytearray = field(init=False, repr=False)
+    moves: list[tuple[int, ...]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        width = self.map.width
+        directions = ((RIGHT, 1), (UP, -width), (LEFT, -1), (DOWN, width))
+        self.moves = [tuple(offset for bit, offset in directions if mask & bit)
+                      for mask in range(16)]
+        self.compute_masks()
 
     @classmethod
     def create(cls, input: Iterator[str]) -> Self:
-        map = list(input)
-        width = len(map[0])
-        height = len(map)
-        return Map(map, Position(width - 1, height - 1))
+        map = Grid.parse(input)
+        heights = map.cells.replace(b'S', b'a').replace(b'E', b'z')
+        return Map(map, heights)
 
     def can_climb(self, *, from_pos: Position, to_pos: Position) -> bool:
         """ Checks if one gan walk from the elevation at from_pos to the elevation at to_pos """
@@ -43,37 +77,348 @@ class Map:
 
     def get_elevation(self, position: Position) -> str:
         """ returns the elevation at the given position """
-        return self.map[position.y][position.x]
+        return chr(self.map[position])
 
     def find_marker(self, point: str) -> Position:
         """ Returns the position of the first marker matching the argument """
-        for y, row in enumerate(self.map):
-            for x, char in enumerate(row):
-                if char == point:
-                    return Position(x, y)
-
-        raise Exception(f"Did not find point {point}")
+        index = self.map.find(ord(point))
+        if index is None:
+            raise Exception(f"Did not find point {point}")
+        return self.map.position(index)
 
     def find_path(self, target: str):
-        """ Finds a path backwards from the Endpoint to an elevation/marker target """
-        endpoint = self.find_marker('E')
-        found: set[Position] = {endpoint}
-        queue: Queue[tuple[int, Position]] = Queue()
-        queue.put((0, endpoint))
-        while not queue.empty():
-            current_len, current_pos = queue.get()
-            for next_position in self.next_step(current_pos):
-                if next_position not in found:
-                    elevation = self.get_elevation(next_position)
-                    if elevation == target:
+        """
+        Finds a path backwards from the Endpoint to an elevation/marker target.
+        Works on the flat cell indices. 'S' and 'E' count as 'a' and 'z' in heights,
+        which gives the same steps as can_climb
+        """
+        endpoint = self.map.find(ord('E'))
+        if endpoint is None:
+            raise Exception("Did not find point E")
+
+        cells = self.map.cells
+        heights = self.heights
+        goal = ord(target)
+        found = bytearray(len(cells))
+        found[endpoint] = 1
+        queue: deque[tuple[int, int]] = deque([(0, endpoint)])
+        while queue:
+            current_len, current = queue.popleft()
+            lowest = heights[current] - 1
+            for neighbor in self.map.neighbors(current):
+                if not found[neighbor] and heights[neighbor] >= lowest:
+                    if cells[neighbor] == goal:
                         return current_len + 1
-                    found.add(next_position)
-                    queue.put((current_len + 1, next_position))
+                    found[neighbor] = 1
+                    queue.append((current_len + 1, neighbor))
+        raise Exception('No Path found')
+
+    def estimate(self, index: int, target: int, climbing: bool) -> int:
+        """
+        A lower bound for the steps between the cells index and target, walking towards
+        target if climbing is set and away from it otherwise. Consistent, as each step
+        moves one cell and climbs at most one elevation
+        """
+        width = self.map.width
+        y, x = divmod(index, width)
+        target_y, target_x = divmod(target, width)
+        if climbing:
+            climb = self.heights[target] - self.heights[index]
+        else:
+            climb = self.heights[index] - self.heights[target]
+        return max(abs(x - target_x) + abs(y - target_y), climb)
+
+    def compute_masks(self):
+        """
+        Computes the step masks of all cells from the differences in height between
+        horizontal and vertical neighbors, in one pass over the heights each
+        """
+        heights, width = self.heights, self.map.width
+        size = len(heights)
+        across = [right - left for left, right in zip(heights, heights[1:])]
+        along = [lower - upper for upper, lower in zip(heights, heights[width:])]
+
+        climbs_right = [RIGHT if diff <= 1 else 0 for diff in across] + [0]
+        climbs_left = [0] + [LEFT if diff >= -1 else 0 for diff in across]
+        descents_right = [RIGHT if diff >= -1 else 0 for diff in across] + [0]
+        descents_left = [0] + [LEFT if diff <= 1 else 0 for diff in across]
+        # the neighbors across a row border are not neighbors at all
+        for start in range(0, size, width):
+            climbs_left[start] = descents_left[start] = 0
+            climbs_right[start + width - 1] = descents_right[start + width - 1] = 0
+
+        climbs_up = [0] * width + [UP if diff >= -1 else 0 for diff in along]
+        climbs_down = [DOWN if diff <= 1 else 0 for diff in along] + [0] * width
+        descents_up = [0] * width + [UP if diff <= 1 else 0 for diff in along]
+        descents_down = [DOWN if diff >= -1 else 0 for diff in along] + [0] * width
+
+        self.climbs = bytearray(map(sum, zip(climbs_right, climbs_up, climbs_left, climbs_down)))
+        self.descents = bytearray(map(sum, zip(descents_right, descents_up, descents_left,
+                                               descents_down)))
+
+    def update_masks(self, index: int):
+        """ Recomputes the step masks of the cell index from the heights """
+        heights, width = self.heights, self.map.width
+        height = heights[index]
+        x = index % width
+        climbs = descents = 0
+        for bit, neighbor, exists in ((RIGHT, index + 1, x + 1 < width),
+                                      (UP, index - width, index >= width),
+                                      (LEFT, index - 1, x > 0),
+                                      (DOWN, index + width, index + width < len(heights))):
+            if exists:
+                if heights[neighbor] <= height + 1:
+                    climbs |= bit
+                if heights[neighbor] >= height - 1:
+                    descents |= bit
+        self.climbs[index] = climbs
+        self.descents[index] = descents
+
+    def set_height(self, index: int, height: int):
+        """ Changes the height of the cell index and the masks of the cell and its neighbors """
+        self.heights[index] = height
+        self.update_masks(index)
+        for neighbor in self.map.neighbors(index):
+            self.update_masks(neighbor)
+
+    def steps(self, index: int, climbing: bool) -> list[int]:
+        """
+        Returns the neighbors one can climb to from the cell index. If climbing is not set
+        it returns the neighbors one could have climbed from instead
+        """
+        mask = self.climbs[index] if climbing else self.descents[index]
+        return [index + offset for offset in self.moves[mask]]
+
+    def trace_back(self, parents: dict[int, int], index: int) -> list[Position]:
+        """ Returns the positions from the start of a search up to the given cell """
+        path = [index]
+        while index in parents:
+            index = parents[index]
+            path.append(index)
+        return [self.map.position(index) for index in reversed(path)]
+
+    def breadth_first(self, start: Position, goal: Position, with_path: bool = False) -> Route:
+        """ Finds the shortest route from start to goal by a plain breadth first search """
+        start_index, goal_index = self.map.index(start.x, start.y), self.map.index(goal.x, goal.y)
+        parents: dict[int, int] = {}
+        found = {start_index}
+        queue: deque[tuple[int, int]] = deque([(0, start_index)])
+        expanded = 0
+        while queue:
+            length, current = queue.popleft()
+            expanded += 1
+            if current == goal_index:
+                path = self.trace_back(parents, current) if with_path else None
+                return Route(length, expanded, path)
+            for neighbor in self.steps(current, True):
+                if neighbor not in found:
+                    found.add(neighbor)
+                    parents[neighbor] = current
+                    queue.append((length + 1, neighbor))
+        raise Exception('No Path found')
+
+    def a_star(self, start: Position, goal: Position, with_path: bool = False) -> Route:
+        """ Finds the shortest route from start to goal by A*, guided by estimate """
+        start_index, goal_index = self.map.index(start.x, start.y), self.map.index(goal.x, goal.y)
+        lengths = {start_index: 0}
+        parents: dict[int, int] = {}
+        # ties are broken towards the longer route, which is closer to the goal
+        queue = [(self.estimate(start_index, goal_index, True), 0, start_index)]
+        expanded = 0
+        while queue:
+            _, negative_length, current = heappop(queue)
+            length = -negative_length
+            if length > lengths[current]:
+                continue
+            expanded += 1
+            if current == goal_index:
+                path = self.trace_back(parents, current) if with_path else None
+                return Route(length, expanded, path)
+            for neighbor in self.steps(current, True):
+                if length + 1 < lengths.get(neighbor, inf):
+                    lengths[neighbor] = length + 1
+                    parents[neighbor] = current
+                    estimate = self.estimate(neighbor, goal_index, True)
+                    heappush(queue, (length + 1 + estimate, -length - 1, neighbor))
         raise Exception('No Path found')
 
+    def bidirectional_a_star(self, start: Position, goal: Position,
+                             with_path: bool = False) -> Route:
+        """
+        Finds the shortest route from start to goal by two A* searches, one climbing from
+        the start and one descending from the goal, until both queues can not do better
+        """
+        start_index, goal_index = self.map.index(start.x, start.y), self.map.index(goal.x, goal.y)
+        targets = (goal_index, start_index)
+        lengths: tuple[dict[int, int], dict[int, int]] = ({start_index: 0}, {goal_index: 0})
+        parents: tuple[dict[int, int], dict[int, int]] = ({}, {})
+        queues = ([(self.estimate(start_index, goal_index, True), 0, start_index)],
+                  [(self.estimate(goal_index, start_index, False), 0, goal_index)])
+        best, meeting = inf, -1
+        expanded = 0
+        while queues[0] and queues[1] and best > max(queues[0][0][0], queues[1][0][0]):
+            side = 0 if len(queues[0]) <= len(queues[1]) else 1
+            climbing = side == 0
+            own, other = lengths[side], lengths[1 - side]
+            _, negative_length, current = heappop(queues[side])
+            length = -negative_length
+            if length > own[current]:
+                continue
+            expanded += 1
+            if current in other and length + other[current] < best:
+                best, meeting = length + other[current], current
+            for neighbor in self.steps(current, climbing):
+                if length + 1 < own.get(neighbor, inf):
+                    own[neighbor] = length + 1
+                    parents[side][neighbor] = current
+                    estimate = self.estimate(neighbor, targets[side], climbing)
+                    heappush(queues[side], (length + 1 + estimate, -length - 1, neighbor))
+                    if neighbor in other and length + 1 + other[neighbor] < best:
+                        best, meeting = length + 1 + other[neighbor], neighbor
+
+        if meeting < 0:
+            raise Exception('No Path found')
+
+        path = None
+        if with_path:
+            # the second half is traced from the goal, so it comes in reverse
+            path = (self.trace_back(parents[0], meeting)
+                    + self.trace_back(parents[1], meeting)[-2::-1])
+        return Route(lengths[0][meeting] + lengths[1][meeting], expanded, path)
+
     def next_step(self, current_pos: Position) -> Iterator[Position]:
         """ yields all neighbors, that could have been the previous step to this one"""
         for neighbor in current_pos.unit_neighbors():
-            if (neighbor.is_within(ORIGIN, self.bottom_right)
+            if (self.map.is_within(neighbor.x, neighbor.y)
                     and self.can_climb(from_pos=neighbor, to_pos=current_pos)):
                 yield neighbor
+
+
+# The distance of cells from which 'E' can not be reached
+UNREACHABLE = (1 << 31) - 1
+
+
+@dataclass(slots=True)
+class DistanceField:
+    """
+    The length of the shortest path from every cell of a map to 'E', in a flat array.
+    After edits only the affected distances are repaired, like Lifelong Planning A* does:
+    rhs holds one more than the best distance of a neighbor one can climb to
+    """
+    map: Map
+    endpoint: int
+    distances: array[int]
+    rhs: array[int]
+    by_marker: dict[int, Counter[int]]
+    shortest: dict[int, int]
+
+    @classmethod
+    def create(cls, map: Map) -> DistanceField:
+        """ Creates the distances with a single breadth first search backwards from 'E' """
+        endpoint = map.map.find(ord('E'))
+        if endpoint is None:
+            raise Exception("Did not find point E")
+
+        distances = array('i', [UNREACHABLE]) * len(map.heights)
+        distances[endpoint] = 0
+        descents, moves = map.descents, map.moves
+        queue = deque([endpoint])
+        while queue:
+            current = queue.popleft()
+            for offset in moves[descents[current]]:
+                neighbor = current + offset
+                if distances[neighbor] == UNREACHABLE:
+                    distances[neighbor] = distances[current] + 1
+                    queue.append(neighbor)
+
+        by_marker: dict[int, Counter[int]] = {}
+        for (marker, distance), count in Counter(zip(map.map.cells, distances)).items():
+            if distance != UNREACHABLE:
+                by_marker.setdefault(marker, Counter())[distance] = count
+        shortest = {marker: min(counts) for marker, counts in by_marker.items()}
+
+        return cls(map, endpoint, distances, array('i', distances), by_marker, shortest)
+
+    def distance_from(self, position: Position) -> int | None:
+        """ Returns the length of the shortest path from position to 'E', if there is any """
+        distance = self.distances[self.map.map.index(position.x, position.y)]
+        return distance if distance != UNREACHABLE else None
+
+    def shortest_from(self, marker: str) -> int:
+        """ Returns the length of the shortest path to 'E' from any cell with the given marker """
+        shortest = self.shortest.get(ord(marker))
+        if shortest is None:
+            raise Exception('No Path found')
+        return shortest
+
+    def set_elevations(self, changes: Iterable[tuple[Position, str]]):
+        """ Changes the elevation of the given cells, then repairs the distances """
+        grid = self.map.map
+        queue: list[tuple[int, int]] = []
+        for position, elevation in changes:
+            if not 'a' <= elevation <= 'z':
+                raise Exception(f"Not a valid elevation: {elevation}")
+            index = grid.index(position.x, position.y)
+            if grid[position] in b'SE':
+                raise Exception(f"Can not change the elevation of a marker at {position}")
+            self.set_distance(index, self.distances[index], ord(elevation))
+            self.map.set_height(index, ord(elevation))
+            self.update(index, queue)
+            for neighbor in grid.neighbors(index):
+                self.update(neighbor, queue)
+        self.repair(queue)
+
+    def set_elevation(self, position: Position, elevation: str):
+        self.set_elevations([(position, elevation)])
+
+    def set_distance(self, index: int, distance: int, marker: int | None = None):
+        """
+        Sets the distance of a cell (and maybe its marker), keeping by_marker and shortest
+        up to date. The shortest distance is only searched for again when its last cell is gone
+        """
+        cells = self.map.map.cells
+        old_distance = self.distances[index]
+        if old_distance != UNREACHABLE:
+            old_marker = cells[index]
+            counts = self.by_marker[old_marker]
+            counts[old_distance] -= 1
+            if counts[old_distance] == 0:
+                del counts[old_distance]
+                if self.shortest[old_marker] == old_distance:
+                    if counts:
+                        self.shortest[old_marker] = min(counts)
+                    else:
+                        del self.shortest[old_marker]
+        if marker is not None:
+            cells[index] = marker
+        if distance != UNREACHABLE:
+            self.by_marker.setdefault(cells[index], Counter())[distance] += 1
+            self.shortest[cells[index]] = min(self.shortest.get(cells[index], distance), distance)
+        self.distances[index] = distance
+
+    def update(self, index: int, queue: list[tuple[int, int]]):
+        """ Recomputes rhs of the cell and queues it, if it does not match its distance """
+        if index != self.endpoint:
+            best = min((self.distances[neighbor] for neighbor in self.map.steps(index, True)),
+                       default=UNREACHABLE)
+            self.rhs[index] = best + 1 if best != UNREACHABLE else UNREACHABLE
+        if self.distances[index] != self.rhs[index]:
+            heappush(queue, (min(self.distances[index], self.rhs[index]), index))
+
+    def repair(self, queue: list[tuple[int, int]]):
+        """ Fixes all queued cells and every cell that is affected by them """
+        distances, rhs = self.distances, self.rhs
+        while queue:
+            key, current = heappop(queue)
+            if distances[current] == rhs[current] or key != min(distances[current], rhs[current]):
+                # already fixed or queued again with another key
+                continue
+
+            if distances[current] > rhs[current]:
+                self.set_distance(current, rhs[current])
+            else:
+                # the old path got longer: forget it, then look at the cell again
+                self.set_distance(current, UNREACHABLE)
+                self.update(current, queue)
+            for neighbor in self.map.steps(current, False):
+                self.update(neighbor, queue)
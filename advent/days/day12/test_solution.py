@@ -1,19 +1,20 @@
 from advent.common import input
+from advent.common.position import Position
 
-from .solution import Map, day_num, part1, part2
+from .solution import DistanceField, Map, day_num, parse, part1, part2
 
 
 def test_part1():
     lines = input.read_lines(day_num, 'example01.txt')
     expected = 31
-    result = part1(lines)
+    result = part1(parse(lines))
     assert result == expected
 
 
 def test_part2():
     lines = input.read_lines(day_num, 'example01.txt')
     expected = 29
-    result = part2(lines)
+    result = part2(parse(lines))
     assert result == expected
 
 
@@ -22,3 +23,66 @@ def test_path():
     expected = 31
     result = Map.create(lines).find_path('S')
     assert result == expected
+
+
+def test_a_star():
+    map = Map.create(input.read_lines(day_num, 'example01.txt'))
+    start, goal = map.find_marker('S'), map.find_marker('E')
+    expected = map.breadth_first(start, goal)
+    result = map.a_star(start, goal)
+    assert result.length == expected.length
+    assert result.expanded <= expected.expanded
+
+
+def test_bidirectional_a_star_path():
+    map = Map.create(input.read_lines(day_num, 'example01.txt'))
+    start, goal = map.find_marker('S'), map.find_marker('E')
+    result = map.bidirectional_a_star(start, goal, with_path=True)
+    assert result.length == 31
+    assert result.path is not None and len(result.path) == 32
+    assert result.path[0] == start and result.path[-1] == goal
+    assert all(map.can_climb(from_pos=a, to_pos=b) and a.taxicab_distance(b) == 1
+               for a, b in zip(result.path, result.path[1:]))
+
+
+def test_step_masks():
+    map = Map.create(input.read_lines(day_num, 'example01.txt'))
+    heights = map.heights
+    for index in range(len(heights)):
+        climbs = [neighbor for neighbor in map.map.neighbors(index)
+                  if heights[neighbor] <= heights[index] + 1]
+        descents = [neighbor for neighbor in map.map.neighbors(index)
+                    if heights[neighbor] >= heights[index] - 1]
+        assert map.steps(index, True) == climbs
+        assert map.steps(index, False) == descents
+
+
+def test_distance_field():
+    map = Map.create(input.read_lines(day_num, 'example01.txt'))
+    distances = DistanceField.create(map)
+    assert distances.distance_from(map.find_marker('S')) == 31
+    assert distances.distance_from(map.find_marker('E')) == 0
+    assert distances.shortest_from('a') == 29
+
+
+def test_repair_after_edit():
+    map = Map.create(input.read_lines(day_num, 'example01.txt'))
+    distances = DistanceField.create(map)
+    changes = [(Position(1, 1), 'a'), (Position(0, 4), 'b')]
+    distances.set_elevations(changes)
+
+    fresh = DistanceField.create(Map(map.map.copy(), map.heights.copy()))
+    assert distances.distances == fresh.distances
+    assert distances.distance_from(map.find_marker('S')) == 31
+    assert distances.shortest_from('a') == fresh.shortest_from('a') == 30
+    assert distances.shortest == fresh.shortest
+    assert (map.climbs, map.descents) == (fresh.map.climbs, fresh.map.descents)
+
+
+def test_edit_cuts_path():
+    map = Map.create(input.read_lines(day_num, 'example01.txt'))
+    distances = DistanceField.create(map)
+    distances.set_elevation(Position(4, 2), 'a')
+    assert distances.distance_from(map.find_marker('S')) is None
+    distances.set_elevation(Position(4, 2), 'z')
+    assert distances.distance_from(map.find_marker('S')) == 31
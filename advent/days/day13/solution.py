@@ -1,8 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from itertools import zip_longest
+import json
+import re
 
-from typing import Iterator, Self
+from typing import Iterable, Iterator, Self
 
 day_num = 13
 
@@ -13,22 +14,22 @@ def part1(lines: Iterator[str]) -> int:
 
 
 def part2(lines: Iterator[str]) -> int:
-    """ Why sort if your can simply count?"""
-    marker2 = PacketList([[2]])
-    marker6 = PacketList([[6]])
+    return decoder_key(PacketList.parse(line) for line in lines if line)
 
-    p2 = 1
-    p6 = 1
-    for packet_list in (PacketList.parse(line) for line in lines if line):
-        if packet_list < marker2:
-            p2 += 1
-        elif packet_list < marker6:
-            p6 += 1
 
-    return p2 * (p2 + p6)
+ListOrInt = list["ListOrInt"] | int
+SortKey = tuple[int, ...]
 
+# The tokens of a sort key besides the ints. Both are smaller than any int of a packet
+CLOSE = -2
+OPEN = -1
 
-ListOrInt = list["ListOrInt"] | int
+DIVIDERS = [[[2]], [[6]]]
+
+# A number or any other single character
+TOKEN = re.compile(r"\d+|.", re.DOTALL)
+# Deletes all characters a packet consists of
+PACKET_CHARACTERS = str.maketrans('', '', '[],0123456789')
 
 
 @dataclass(slots=True, frozen=True, eq=False)
@@ -36,32 +37,40 @@ class PacketList:
     line: list[ListOrInt]
 
     @classmethod
-    def _parse_sublist(cls, line_iter: Iterator[str]) -> list[ListOrInt]:
-        """ Parses a sublist. Assumes that we do not find multiple commas, ot List in a row."""
-        parsed: list[ListOrInt] = []
+    def parse_tokens(cls, line: str) -> list[ListOrInt]:
+        """
+        Parses a line token by token, with a stack instead of recursion for the sublists.
+        Assumes that we do not find multiple commas, ot List in a row. Everything after the
+        closing ']' of the packet is ignored
+        """
+        if not line.startswith('['):
+            raise Exception(f"line does not start with [: {line}")
+
+        stack: list[list[ListOrInt]] = [[]]
         number: int | None = None
-        for character in line_iter:
-            match character:
+        for token in TOKEN.findall(line, 1):
+            match token:
                 case '[':
                     if number is not None:
                         raise Exception("Did not expect list")
-                    parsed.append(cls._parse_sublist(line_iter))
+                    stack.append([])
 
                 case ']':
                     if number is not None:
-                        parsed.append(number)
-                    return parsed
+                        stack[-1].append(number)
+                        number = None
+                    parsed = stack.pop()
+                    if not stack:
+                        return parsed
+                    stack[-1].append(parsed)
 
                 case ',':
                     if number is not None:
-                        parsed.append(number)
+                        stack[-1].append(number)
                         number = None
 
-                case digit if digit.isdecimal():
-                    if number is None:
-                        number = int(digit)
-                    else:
-                        number = number * 10 + int(digit)
+                case digits if digits.isdecimal():
+                    number = int(digits)
 
                 case c:
                     raise Exception(f"Illegal Character: {c}")
@@ -69,52 +78,162 @@ class PacketList:
 
     @classmethod
     def parse(cls, line: str) -> Self:
-        """ Parses the given line into a PacktList """
-        line_iter = iter(line)
-        if next(line_iter) != '[':
-            raise Exception(f"line does not start with [: {line}")
-
-        return PacketList(cls._parse_sublist(line_iter))
+        """
+        Parses the given line into a PacktList. A line of nothing but brackets, commas and
+        digits is valid JSON in all but a few cases, so it is given to json.loads first.
+        Anything it does not accept is left to parse_tokens, which is more lenient
+        and raises the errors for invalid lines
+        """
+        if line.startswith('[') and not line.translate(PACKET_CHARACTERS):
+            try:
+                return cls(json.loads(line))
+            except (ValueError, RecursionError):
+                pass
+        return cls(cls.parse_tokens(line))
+
+    def depth(self) -> int:
+        """ Returns how deep the deepest int is nested, the ints of the packet itself are at 1 """
+        deepest = 0
+        stack = [(self.line, 1)]
+        while stack:
+            items, depth = stack.pop()
+            for item in items:
+                if isinstance(item, int):
+                    deepest = max(deepest, depth)
+                else:
+                    stack.append((item, depth + 1))
+        return deepest
+
+    def sort_key(self, depth: int) -> SortKey:
+        """
+        Returns a flat key, whose natural order is the order of the packets. Every int is
+        wrapped in lists down to depth, which must be at least the depth of all compared packets
+        """
+        key, deepest = self.cut_key(depth, None)
+        if deepest > depth:
+            raise Exception(f"Packet is nested deeper than {depth}")
+        return key
 
-    @classmethod
-    def _comp_sublists(cls, left: list[ListOrInt], right: list[ListOrInt]) -> bool | None:
+    def cut_key(self, depth: int, limit: int | None) -> tuple[SortKey, int]:
         """
-        Compares two sublists.
-        Return true if left comes before right
-               false if right comes before left
-               None if left and right are equal
+        Returns the sort key cut after limit tokens and 0, if the key is valid at depth. With a
+        limit a list counts as deep as its items, which might be cut off. The key ends at the
+        first item deeper than depth, then the depth it needs at least is returned instead
         """
-        for left_item, right_item in zip_longest(left, right, fillvalue=None):
-            match (left_item, right_item):
-                case int(left_int), int(right_int):
-                    if left_int != right_int:
-                        return left_int < right_int
-
-                case list(left_list), list(right_list):
-                    result = cls._comp_sublists(left_list, right_list)
-                    if result is not None:
-                        return result
-
-                case int(left_int), list(right_list):
-                    result = cls._comp_sublists([left_int], right_list)
-                    if result is not None:
-                        return result
-
-                case list(left_list), int(right_int):
-                    result = cls._comp_sublists(left_list, [right_int])
-                    if result is not None:
-                        return result
-
-                case _:
-                    return left_item is None
+        tokens = [OPEN]
+        stack = [iter(self.line)]
+        while stack and (limit is None or len(tokens) < limit):
+            item = next(stack[-1], None)
+            if item is None:
+                tokens.append(CLOSE)
+                stack.pop()
+            elif isinstance(item, int):
+                wrapping = depth - len(stack)
+                if wrapping < 0:
+                    return tuple(tokens), len(stack)
+                tokens.extend([OPEN] * wrapping)
+                tokens.append(item)
+                tokens.extend([CLOSE] * wrapping)
+            else:
+                if limit is not None:
+                    if len(stack) >= depth:
+                        # lists nested right in each other are skipped, to not stop at each
+                        nested = len(stack) + 1
+                        while item and isinstance(item[0], list):
+                            item = item[0]
+                            nested += 1
+                        return tuple(tokens), nested
+                tokens.append(OPEN)
+                stack.append(iter(item))
+        return tuple(tokens[:limit]), 0
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, PacketList):
             return False
-        return PacketList._comp_sublists(self.line, other.line) is None
+        return compare(self.line, other.line) == 0
 
     def __lt__(self, other: PacketList) -> bool:
-        return PacketList._comp_sublists(self.line, other.line) is True
+        return compare(self.line, other.line) < 0
+
+
+def compare(left: ListOrInt, right: ListOrInt) -> int:
+    """
+    Compares two packets, returns a negative number if left comes before right, a positive
+    one if right comes before left and 0 if both are equal. Uses a stack instead of recursion
+    """
+    # an int compared to a list goes on the stack as it is, standing for a list of just itself
+    lefts, rights, positions = [left], [right], [0]
+    while positions:
+        current_left, current_right, position = lefts[-1], rights[-1], positions[-1]
+        left_len = 1 if type(current_left) is int else len(current_left)
+        right_len = 1 if type(current_right) is int else len(current_right)
+        if position >= left_len or position >= right_len:
+            if left_len != right_len:
+                return left_len - right_len
+            lefts.pop()
+            rights.pop()
+            positions.pop()
+            continue
+
+        positions[-1] = position + 1
+        left_item = current_left if type(current_left) is int else current_left[position]
+        right_item = current_right if type(current_right) is int else current_right[position]
+        if type(left_item) is int and type(right_item) is int:
+            if left_item != right_item:
+                return left_item - right_item
+        else:
+            lefts.append(left_item)
+            rights.append(right_item)
+            positions.append(0)
+    return 0
+
+
+def sort_keys(packets: Iterable[PacketList]) -> list[SortKey]:
+    """ Returns the sort keys of all packets, all using the same depth so they can be compared """
+    packets = list(packets)
+    depth = max((packet.depth() for packet in packets), default=1)
+    return [packet.sort_key(depth) for packet in packets]
+
+
+def decoder_key(packets: Iterable[PacketList]) -> int:
+    """
+    Returns the product of the positions the divider packets get, when they are sorted
+    together with the given packets. Nothing is sorted, the packets before each divider are
+    counted by comparing their keys, cut just after the length of the divider keys
+    """
+    dividers = [PacketList(divider) for divider in DIVIDERS]
+    divider_depth = max(divider.depth() for divider in dividers)
+    dividers.sort(key=lambda divider: divider.sort_key(divider_depth))
+
+    # the divider keys and the length to cut packet keys at, for each depth needed so far
+    divider_keys: dict[int, tuple[list[SortKey], int]] = {}
+    before = [0] * len(dividers)
+    # packets tend to be alike, so each starts at the depth the one before needed. A key is
+    # also valid at any depth above that, it just gets longer, so a depth that more than
+    # doubled for a single packet is not kept
+    depth = divider_depth
+    for packet in packets:
+        start = depth
+        while True:
+            if depth not in divider_keys:
+                keys = [divider.sort_key(depth) for divider in dividers]
+                divider_keys[depth] = keys, max(map(len, keys)) + 1
+            keys, limit = divider_keys[depth]
+            key, deepest = packet.cut_key(depth, limit)
+            if deepest <= depth:
+                break
+            depth = deepest
+        if depth > 2 * start:
+            depth = start
+
+        for index, divider_key in enumerate(keys):
+            if key < divider_key:
+                before[index] += 1
+
+    result = 1
+    for position, count in enumerate(before, start=1):
+        result *= count + position
+    return result
 
 
 def parse_single_pair(lines: Iterator[str]) -> tuple[PacketList, PacketList]:
@@ -0,0 +1,90 @@
+from __future__ import annotations
+from argparse import ArgumentParser
+from itertools import zip_longest
+import sys
+
+from advent.bench import format_stats, time_runs
+
+from .solution import ListOrInt, PacketList, compare
+
+
+def deep_packet(depth: int) -> str:
+    """ Returns a packet with a single int nested depth lists deep """
+    return '[' * depth + '1' + ']' * depth
+
+
+def long_packet(length: int) -> str:
+    """ Returns a packet of length items, alternating between ints and short lists """
+    items = (str(n % 100) if n % 2 == 0 else f'[{n % 10},[{n % 7}]]' for n in range(length))
+    return '[' + ','.join(items) + ']'
+
+
+def recursive_compare(left: list[ListOrInt], right: list[ListOrInt]) -> bool | None:
+    """
+    The former comparison of packets, kept to compare against. It recurses once per level
+    and wraps an int in a new list whenever it is compared to a list
+    """
+    for left_item, right_item in zip_longest(left, right, fillvalue=None):
+        match (left_item, right_item):
+            case int(left_int), int(right_int):
+                if left_int != right_int:
+                    return left_int < right_int
+
+            case list(left_list), list(right_list):
+                result = recursive_compare(left_list, right_list)
+                if result is not None:
+                    return result
+
+            case int(left_int), list(right_list):
+                result = recursive_compare([left_int], right_list)
+                if result is not None:
+                    return result
+
+            case list(left_list), int(right_int):
+                result = recursive_compare(left_list, [right_int])
+                if result is not None:
+                    return result
+
+            case _:
+                return left_item is None
+
+
+def benchmark_compare(name: str, left: PacketList, right: PacketList, runs: int):
+    stats = time_runs(lambda: compare(left.line, right.line), runs, 1)
+    print(f'{name:>8} compare          : {format_stats(stats)}')
+    try:
+        stats = time_runs(lambda: recursive_compare(left.line, right.line), runs, 1)
+        print(f'{name:>8} recursive_compare: {format_stats(stats)}')
+    except RecursionError:
+        print(f'{name:>8} recursive_compare: exceeds the recursion limit')
+
+
+def main(arguments: list[str]) -> int:
+    parser = ArgumentParser(prog='python -m advent.days.day13.stress',
+                            description='Benchmarks parsing and comparing large packets')
+    parser.add_argument('--depth', type=int, default=10_000, help='nesting of the deep packet')
+    parser.add_argument('--length', type=int, default=100_000, help='items of the long packet')
+    parser.add_argument('-n', '--runs', type=int, default=10, help='number of timed runs')
+    args = parser.parse_args(arguments)
+
+    packets = {'deep': deep_packet(args.depth), 'long': long_packet(args.length)}
+    print()
+    for name, line in packets.items():
+        stats = time_runs(lambda: PacketList.parse(line), args.runs, 1)
+        print(f'{name:>8} parse            : {format_stats(stats)}')
+        stats = time_runs(lambda: PacketList.parse_tokens(line), args.runs, 1)
+        print(f'{name:>8} parse_tokens     : {format_stats(stats)}')
+
+    # each pair only differs at its very end, so the packets are compared completely
+    print()
+    deep = PacketList.parse(packets['deep'])
+    benchmark_compare('deep', deep, PacketList.parse(packets['deep'].replace('1', '2')),
+                      args.runs)
+    benchmark_compare('promoted', PacketList([1]), deep, args.runs)
+    long = PacketList.parse(packets['long'])
+    benchmark_compare('long', long, PacketList(long.line[:-1] + [[99]]), args.runs)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
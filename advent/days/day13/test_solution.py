@@ -1,6 +1,13 @@
+from random import Random
+
+import pytest
+
 from advent.common import input
 
-from .solution import day_num, parse_single_pair, PacketList, part1, part2
+from . import solution
+from .solution import (DIVIDERS, compare, day_num, decoder_key, ListOrInt, parse_single_pair,
+                       PacketList, part1, part2, sort_keys)
+from .stress import deep_packet, long_packet
 
 
 def test_part1():
@@ -39,3 +46,103 @@ def test_compare1():
 def test_compare3():
     left, right = PacketList([9]), PacketList([8, 7, 6])
     assert not left < right
+
+
+def test_sort_keys():
+    packets = [PacketList([[1], [2, 3, 4]]), PacketList([1, [2, [3, [4]]]]), PacketList([]),
+               PacketList([[]]), PacketList([[[]]]), PacketList([3])]
+    expected = [PacketList([]), PacketList([[]]), PacketList([[[]]]),
+                PacketList([[1], [2, 3, 4]]), PacketList([1, [2, [3, [4]]]]), PacketList([3])]
+    keys = sort_keys(packets)
+    result = [packet for _, packet in sorted(zip(keys, packets), key=lambda pair: pair[0])]
+    assert result == expected
+
+
+def test_sort_key_promotes_ints():
+    left, right = sort_keys([PacketList([5, 1]), PacketList([[[5]], 1])])
+    assert left == right
+
+
+def test_decoder_key():
+    lines = input.read_lines(day_num, 'example01.txt')
+    expected = 140
+    result = decoder_key(PacketList.parse(line) for line in lines if line)
+    assert result == expected
+
+
+def test_parse_deep_packet():
+    result = PacketList.parse(deep_packet(10_000))
+    assert result.depth() == 10_000
+
+
+def test_parse_long_packet():
+    result = PacketList.parse(long_packet(1_000))
+    assert len(result.line) == 1_000
+    assert result.line[:2] == [0, [1, [1]]]
+
+
+def test_parse_lenient():
+    assert PacketList.parse("[1,,2]]x") == PacketList([1, 2])
+
+
+def test_parse_errors():
+    for line, message in [("1,2]", "line does not start with [: 1,2]"),
+                          ("[1[2]]", "Did not expect list"),
+                          ("[1, 2]", "Illegal Character:  "),
+                          ("[[1]", "End of Input without reaching ']'")]:
+        try:
+            PacketList.parse(line)
+            assert False
+        except Exception as e:
+            assert str(e) == message
+
+
+def test_compare_deep():
+    left = PacketList.parse(deep_packet(10_000))
+    right = PacketList.parse(deep_packet(10_000).replace('1', '2'))
+    assert left < right
+    assert not right < left
+    assert PacketList([1]) == left
+
+
+def test_compare_promotion():
+    assert compare([[1], 2], [1, [2]]) == 0
+    assert compare([[1, 0]], [1]) > 0
+    assert compare([[]], [0]) < 0
+
+
+def test_decoder_key_deep_packet():
+    lines = [line for line in input.read_lines(day_num, 'example01.txt') if line]
+    packets = [PacketList.parse(line) for line in lines]
+    packets += [PacketList.parse(deep_packet(2000)), PacketList(list(range(1000)))]
+    # both new packets come before [[2]]
+    expected = 12 * 16
+    result = decoder_key(packets)
+    assert result == expected
+
+
+def random_packet(rng: Random, depth: int) -> ListOrInt:
+    if depth == 0 or rng.random() < 0.3:
+        return rng.randrange(11)
+    return [random_packet(rng, depth - 1) for _ in range(rng.randrange(5))]
+
+
+def test_decoder_key_many_packets(monkeypatch: pytest.MonkeyPatch):
+    rng = Random(13)
+    distinct = [PacketList([random_packet(rng, 4) for _ in range(rng.randrange(1, 5))])
+                for _ in range(1000)]
+    packets = [rng.choice(distinct) for _ in range(100_000)]
+    # a single deep packet in between, the packets after it must not get its depth
+    packets.insert(50_000, PacketList.parse(deep_packet(2000)))
+    dividers = [PacketList(divider) for divider in DIVIDERS]
+    expected = 1
+    for position, divider in enumerate(dividers, start=1):
+        expected *= sum(packet < divider for packet in packets) + position
+
+    # only the sort keys may be compared, not the packets themselves
+    def fail(left: ListOrInt, right: ListOrInt) -> int:
+        raise AssertionError("packets were compared")
+
+    monkeypatch.setattr(solution, 'compare', fail)
+    result = decoder_key(packets)
+    assert result == expected
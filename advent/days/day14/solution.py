@@ -2,31 +2,74 @@ from __future__ import annotations
 from dataclasses import dataclass
 from itertools import count
 
-from typing import Iterator, Self
+from typing import Iterable, Iterator, Self
+
+from advent.common.grid import Grid
 
 day_num = 14
 
 
-def part1(lines: Iterator[str]) -> int:
-    cave = BottomLessCave.create(lines)
+def parse(lines: Iterator[str]) -> CaveMap:
+    return CaveMap.get_map(lines, 0)
+
+
+def part1(cave_map: CaveMap) -> int:
+    cave = BottomLessCave.from_map(cave_map)
     return cave.drip_till_forever()
 
 
-def part2(lines: Iterator[str]) -> int:
-    cave = FlooredCave.create(lines, floor=2)
+def part2(cave_map: CaveMap) -> int:
+    cave = FlooredCave.from_map(cave_map, floor=2)
     return cave.drip_till_full()
 
 
+FILLED = 1
+
+SAND_SOURCE = 500, 0
+
+
 @dataclass(slots=True)
 class CaveMap:
-    filled: set[tuple[int, int]]
+    """
+    The cave is stored in a grid that is wide enough for any sand dripping from the source
+    down to max_depths. x_offset is the cave x coordinate of the first grid column
+    """
+    grid: Grid
+    x_offset: int
     max_depths: int
 
+    def index(self, pos: tuple[int, int]) -> int:
+        """ Returns the flat grid index of the given position, which must be within the grid """
+        return self.grid.index(pos[0] - self.x_offset, pos[1])
+
     def is_filled(self, pos: tuple[int, int]) -> bool:
-        return pos in self.filled
+        return self.grid.get(pos[0] - self.x_offset, pos[1], 0) == FILLED
 
     def set_filled(self, pos: tuple[int, int]):
-        self.filled.add(pos)
+        self.grid.cells[self.index(pos)] = FILLED
+
+    def filled_positions(self) -> Iterator[tuple[int, int]]:
+        for index, cell in enumerate(self.grid.cells):
+            if cell == FILLED:
+                y, x = divmod(index, self.grid.width)
+                yield x + self.x_offset, y
+
+    def copy(self, add_floor: int) -> CaveMap:
+        """ Returns an independent copy of this map with the floor moved down by add_floor """
+        if add_floor == 0:
+            return CaveMap(self.grid.copy(), self.x_offset, self.max_depths)
+        return CaveMap.create(self.filled_positions(), self.max_depths + add_floor)
+
+    @classmethod
+    def create(cls, filled: Iterable[tuple[int, int]], max_depths: int) -> Self:
+        filled = list(filled)
+        source_x, _ = SAND_SOURCE
+        min_x = min(min((x for x, _ in filled), default=source_x), source_x - max_depths - 1)
+        max_x = max(max((x for x, _ in filled), default=source_x), source_x + max_depths + 1)
+        grid = Grid.create(max_x - min_x + 1, max_depths + 1)
+        for x, y in filled:
+            grid.cells[grid.index(x - min_x, y)] = FILLED
+        return cls(grid, min_x, max_depths)
 
     @classmethod
     def get_map(cls, lines: Iterator[str], add_floor: int) -> Self:
@@ -38,7 +81,7 @@ class CaveMap:
             for next in path[1:]:
                 rocks.update(cls.get_path(current, next))
                 current = next
-        return CaveMap(rocks, max(y for _, y in rocks) + add_floor)
+        return cls.create(rocks, max(y for _, y in rocks) + add_floor)
 
     @classmethod
     def get_path(cls, from_pos: tuple[int, int],
@@ -80,19 +123,32 @@ class BottomLessCave:
         cave_map = CaveMap.get_map(lines, 0)
         return BottomLessCave(cave_map)
 
+    @classmethod
+    def from_map(cls, cave_map: CaveMap) -> Self:
+        """ Creates a cave from a copy of the given map, as dripping sand fills it """
+        return BottomLessCave(cave_map.copy(0))
+
     def drip(self) -> bool:
-        origin = 500, 0
-        if self.cave_map.is_filled(origin):
+        grid = self.cave_map.grid
+        cells = grid.cells
+        position = self.cave_map.index(SAND_SOURCE)
+        if cells[position] == FILLED:
             return False
 
+        # sand reaching this index has passed all rocks and falls forever
+        abyss = self.cave_map.max_depths * grid.width
         while True:
-            next_pos = self.cave_map.next_free(origin)
-            if next_pos is None:
-                self.cave_map.set_filled(origin)
+            below = position + grid.width
+            for next_pos in (below, below - 1, below + 1):
+                if cells[next_pos] != FILLED:
+                    break
+            else:
+                cells[position] = FILLED
                 return True
-            if next_pos[1] == self.cave_map.max_depths:
+
+            if next_pos >= abyss:
                 return False
-            origin = next_pos
+            position = next_pos
 
     def drip_till_forever(self) -> int:
         for round in count():
@@ -109,18 +165,22 @@ class FlooredCave:
     def create(cls, lines: Iterator[str], floor: int) -> Self:
         return FlooredCave(CaveMap.get_map(lines, floor))
 
+    @classmethod
+    def from_map(cls, cave_map: CaveMap, floor: int) -> Self:
+        return FlooredCave(cave_map.copy(floor))
+
     def drip_till_full(self) -> int:
+        cells = self.cave_map.grid.cells
+        width = self.cave_map.grid.width
         count = 1
-        line: set[tuple[int, int]] = {(500, 0)}
+        line: set[int] = {self.cave_map.index(SAND_SOURCE)}
         for _ in range(self.cave_map.max_depths - 1):
-            next_line: set[tuple[int, int]] = set()
-            for x, y in line:
-                if not self.cave_map.is_filled((x - 1, y + 1)):
-                    next_line.add((x - 1, y + 1))
-                if not self.cave_map.is_filled((x, y + 1)):
-                    next_line.add((x, y + 1))
-                if not self.cave_map.is_filled((x + 1, y + 1)):
-                    next_line.add((x + 1, y + 1))
+            next_line: set[int] = set()
+            for position in line:
+                below = position + width
+                for next_pos in (below - 1, below, below + 1):
+                    if cells[next_pos] != FILLED:
+                        next_line.add(next_pos)
             count += len(next_line)
             line = next_line
         return count
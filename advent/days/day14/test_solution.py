@@ -1,19 +1,19 @@
 from advent.common import input
 
-from .solution import CaveMap, FlooredCave, BottomLessCave, day_num, part1, part2
+from .solution import CaveMap, FlooredCave, BottomLessCave, day_num, parse, part1, part2
 
 
 def test_part1():
     lines = input.read_lines(day_num, 'example01.txt')
     expected = 24
-    result = part1(lines)
+    result = part1(parse(lines))
     assert result == expected
 
 
 def test_part2():
     lines = input.read_lines(day_num, 'example01.txt')
     expected = 93
-    result = part2(lines)
+    result = part2(parse(lines))
     assert result == expected
 
 
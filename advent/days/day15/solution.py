@@ -1,23 +1,28 @@
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass
 from itertools import combinations
 
 from typing import Iterator, Self
 
 from advent.common.position import Position
+from advent.common.position_array import PositionArray
 
 day_num = 15
 
 
-def part1(lines: Iterator[str]) -> int:
+def parse(lines: Iterator[str]) -> tuple[int, SensorMap]:
     row = int(next(lines))
-    sensor_map = SensorMap.parse(lines)
+    return row, SensorMap.parse(lines)
+
+
+def part1(survey: tuple[int, SensorMap]) -> int:
+    row, sensor_map = survey
     return sensor_map.count_impossible(row)
 
 
-def part2(lines: Iterator[str]) -> int:
-    next(lines)
-    sensor_map = SensorMap.parse(lines)
+def part2(survey: tuple[int, SensorMap]) -> int:
+    _, sensor_map = survey
     return sensor_map.get_possible_frequency()
 
 
@@ -174,6 +179,8 @@ class SensorMap:
                                                      sensor2.position.y))
 
     def get_possible_frequency(self) -> int:
+        positions = PositionArray.from_positions(sensor.position for sensor in self.sensors)
+        distances = array('q', (sensor.distance for sensor in self.sensors))
         midlines: list[ManhattenLine] = []
         for sensor1, sensor2 in combinations(self.sensors, 2):
             midline = SensorMap.get_midline(sensor1, sensor2)
@@ -181,7 +188,7 @@ class SensorMap:
                 midlines.append(midline)
         for line1, line2 in combinations(midlines, 2):
             point = line1.crosspoint(line2)
-            if point is not None and all(not sensor.is_within(point) for sensor in self.sensors):
+            if point is not None and not any(positions.within_distance(point, distances)):
                 return SensorMap.tuning_frequency(point)
 
         raise Exception("No point found")
@@ -10,13 +10,15 @@ from typing import Iterator, Literal, NamedTuple, Self
 day_num = 16
 
 
-def part1(lines: Iterator[str]) -> int:
-    system = Network.parse(lines)
+def parse(lines: Iterator[str]) -> Network:
+    return Network.parse(lines)
+
+
+def part1(system: Network) -> int:
     return system.under_pressure(30, 1)
 
 
-def part2(lines: Iterator[str]) -> int:
-    system = Network.parse(lines)
+def part2(system: Network) -> int:
     return system.under_pressure(26, 2)
 
 
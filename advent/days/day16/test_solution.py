@@ -1,19 +1,19 @@
 from advent.common import input
 
-from .solution import Network, RawValve, day_num, part1, part2
+from .solution import Network, RawValve, day_num, parse, part1, part2
 
 
 def test_part1():
     lines = input.read_lines(day_num, 'example01.txt')
     expected = 1651
-    result = part1(lines)
+    result = part1(parse(lines))
     assert result == expected
 
 
 def test_part2():
     lines = input.read_lines(day_num, 'example01.txt')
     expected = 1707
-    result = part2(lines)
+    result = part2(parse(lines))
     assert result == expected
 
 
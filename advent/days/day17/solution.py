@@ -4,6 +4,7 @@ from itertools import cycle
 
 from typing import Iterator, Self
 
+from advent.common.grid import Grid
 from advent.common.position import Position
 
 day_num = 17
@@ -30,6 +31,15 @@ patterns = [["####"],
 @dataclass(slots=True, frozen=True)
 class Pattern:
     lines: list[str]
+    blocks: list[tuple[int, int]]
+
+    @classmethod
+    def create(cls, lines: list[str]) -> Self:
+        blocks = [(x, y)
+                  for y, line in enumerate(lines)
+                  for x, block in enumerate(line)
+                  if block == "#"]
+        return cls(lines, blocks)
 
     @property
     def height(self) -> int:
@@ -40,62 +50,65 @@ class Pattern:
         return len(self.lines[0])
 
     def stones(self, offset: Position) -> Iterator[Position]:
-        for y, line in enumerate(self.lines):
-            for x, block in enumerate(line):
-                if block == "#":
-                    yield Position(offset.x + x, offset.y + y)
+        for x, y in self.blocks:
+            yield Position(offset.x + x, offset.y + y)
+
+
+ROCK = ord('#')
+AIR = ord(' ')
 
 
 @dataclass(slots=True)
 class Cave:
     width: int
-    cave: list[str]
+    cave: Grid
     gas_pushes: Iterator[str]
     rock_dispenser: Iterator[Pattern]
 
     @property
     def height(self) -> int:
-        return len(self.cave)
-
-    def check_free(self, rock: Pattern, position: Position) -> bool:
-        for block in rock.stones(position):
-            if block.y < len(self.cave) and self.cave[block.y][block.x] == '#':
-                return False
+        return self.cave.height
+
+    def check_free(self, rock: Pattern, x: int, y: int) -> bool:
+        cells = self.cave.cells
+        for block_x, block_y in rock.blocks:
+            if block_y + y < self.cave.height:
+                if cells[(block_y + y) * self.width + block_x + x] == ROCK:
+                    return False
         return True
 
     def fix_rock(self, rock: Pattern, position: Position):
-        for _ in range(len(self.cave), position.y + rock.height):
-            self.cave.append(' ' * self.width)
-        for block in rock.stones(position):
-            old = self.cave[block.y]
-            self.cave[block.y] = old[:block.x] + '#' + old[block.x + 1:]
+        if position.y + rock.height > self.cave.height:
+            self.cave.add_rows(position.y + rock.height - self.cave.height, AIR)
+        cells = self.cave.cells
+        for x, y in rock.blocks:
+            cells[(position.y + y) * self.width + position.x + x] = ROCK
 
     @classmethod
     def create(cls, width: int, gas_pushes: str) -> Self:
-        cave = []
-        return cls(width, cave, cycle(gas_pushes), cycle(Pattern(pattern) for pattern in patterns))
+        cave = Grid.create(width, 0, AIR)
+        return cls(width, cave, cycle(gas_pushes),
+                   cycle(Pattern.create(pattern) for pattern in patterns))
 
     def process_one_rock(self) -> tuple[Pattern, Position]:
         rock = next(self.rock_dispenser)
-        position = Position(2, len(self.cave) + 3)
+        x, y = 2, self.cave.height + 3
 
         while True:
             match next(self.gas_pushes):
                 case '<':
-                    next_pos = position.left()
-                    if next_pos.x >= 0 and self.check_free(rock, next_pos):
-                        position = next_pos
+                    if x > 0 and self.check_free(rock, x - 1, y):
+                        x -= 1
                 case '>':
-                    next_pos = position.right()
-                    if (next_pos.x + rock.width <= self.width
-                            and self.check_free(rock, next_pos)):
-                        position = next_pos
+                    if (x + 1 + rock.width <= self.width
+                            and self.check_free(rock, x + 1, y)):
+                        x += 1
                 case c: raise Exception(f"Illegal char: {c}")
 
-            next_pos = position.up()
-            if next_pos.y >= 0 and self.check_free(rock, next_pos):
-                position = next_pos
+            if y > 0 and self.check_free(rock, x, y - 1):
+                y -= 1
             else:
+                position = Position(x, y)
                 self.fix_rock(rock, position)
                 return rock, position
 
@@ -116,12 +129,9 @@ class Cave:
                 if drop_height == max_drop_height and last_max_drop_pattern == pattern:
                     drop_cycle_height = position.y - last_max_drop_row
                     if last_max_drop_row - drop_cycle_height > 0:
-                        different = False
-                        for row in range(last_max_drop_row - drop_cycle_height, last_max_drop_row):
-                            if self.cave[row] != self.cave[row - drop_cycle_height]:
-                                different = True
-                                break
-                        if not different:
+                        first_row = last_max_drop_row - drop_cycle_height
+                        if (self.cave.rows(first_row, last_max_drop_row)
+                                == self.cave.rows(first_row - drop_cycle_height, first_row)):
                             time_diff = time - last_max_drop_time
                             height_diff = self.height - last_max_drop_height
                             cycle_count = (max_rounds - time) // time_diff
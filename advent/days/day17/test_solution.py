@@ -22,7 +22,7 @@ def test_first():
     cave = Cave.create(7, input)
     cave.process_one_rock()
     expected = "  #### "
-    assert cave.cave[0] == expected
+    assert cave.cave.row_str(0) == expected
 
 
 def test_third():
@@ -30,5 +30,5 @@ def test_third():
     cave = Cave.create(7, input)
     height = cave.process_many_rocks(3)
     expected = "####   "
-    assert cave.cave[3] == expected
+    assert cave.cave.row_str(3) == expected
     assert height == 6
@@ -7,13 +7,15 @@ from typing import Iterable, Iterator, Self
 day_num = 18
 
 
-def part1(lines: Iterator[str]) -> int:
-    shower = Shower.create(Position3D.parse_all(lines))
+def parse(lines: Iterator[str]) -> Shower:
+    return Shower.create(Position3D.parse_all(lines))
+
+
+def part1(shower: Shower) -> int:
     return shower.faces
 
 
-def part2(lines: Iterator[str]) -> int:
-    shower = Shower.create(Position3D.parse_all(lines))
+def part2(shower: Shower) -> int:
     return shower.faces - shower.count_trapped_droplets()
 
 
@@ -9,6 +9,8 @@ from queue import PriorityQueue
 import re
 from typing import Iterable, Iterator, Self
 
+from advent.common import parallel
+
 
 day_num = 19
 
@@ -27,7 +29,7 @@ class Processor:
 
     @classmethod
     def pool_it(cls, rounds: int, lines: Iterator[str]) -> Iterable[tuple[Blueprint, int]]:
-        with Pool() as p:
+        with Pool(parallel.worker_budget()) as p:
             return p.map(Processor(rounds), lines)
 
     def __call__(self, line: str) -> tuple[Blueprint, int]:
@@ -7,13 +7,15 @@ from typing import Iterator
 day_num = 21
 
 
-def part1(lines: Iterator[str]) -> int:
-    troop = Monkey.parse_troop(lines)
+def parse(lines: Iterator[str]) -> dict[str, Monkey]:
+    return Monkey.parse_troop(lines)
+
+
+def part1(troop: dict[str, Monkey]) -> int:
     return troop["root"].get_value(troop)
 
 
-def part2(lines: Iterator[str]) -> int:
-    troop = Monkey.parse_troop(lines)
+def part2(troop: dict[str, Monkey]) -> int:
 
     root = troop["root"]
     new_root = Monkey("root", None, Operation.Sub, root.monkeys)
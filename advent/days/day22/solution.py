@@ -1,6 +1,7 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from advent.common.grid import Grid
 from advent.common.position import UNIT_NEG_X, UNIT_NEG_Y, UNIT_X, UNIT_Y, Position
 from enum import Enum
 
@@ -69,9 +70,12 @@ class Player:
         return Player(self.position + self.facing.as_position(), self.facing)
 
 
+SPACE = ord(' ')
+
+
 @dataclass(slots=True)
 class PasswordJungle(ABC):
-    map: list[str]
+    map: Grid
     instructions: str
 
     @abstractmethod
@@ -85,7 +89,7 @@ class PasswordJungle(ABC):
             if not line:
                 break
             map.append(line)
-        return cls(map, next(lines))
+        return cls(Grid.parse(map), next(lines))
 
     def next_instruction(self, start: int) -> tuple[int | Turn, int] | None:
         if start >= len(self.instructions):
@@ -106,34 +110,32 @@ class PasswordJungle(ABC):
         return self.start_column(0), Facing.Right
 
     def start_column(self, row: int) -> Position:
-        for col, char in enumerate(self.map[row]):
-            if char != ' ':
-                return Position(col, row)
-        raise Exception("Empty row found")
+        line = self.map.row(row)
+        col = len(line) - len(line.lstrip(b' '))
+        if col == len(line):
+            raise Exception("Empty row found")
+        return Position(col, row)
 
     def end_column(self, row: int) -> Position:
-        for col in range(len(self.map[row]) - 1, -1, -1):
-            if self.map[row][col] != ' ':
-                return Position(col, row)
-        raise Exception("Empty row found")
+        col = len(self.map.row(row).rstrip(b' ')) - 1
+        if col < 0:
+            raise Exception("Empty row found")
+        return Position(col, row)
 
     def start_row(self, col: int) -> Position:
-        for row, line in enumerate(self.map):
-            if col < len(line) and line[col] != ' ':
+        for row in range(self.map.height):
+            if self.map.get(col, row, SPACE) != SPACE:
                 return Position(col, row)
         raise Exception("Empty row found")
 
     def end_row(self, col: int) -> Position:
-        for row in range(len(self.map) - 1, -1, -1):
-            line = self.map[row]
-            if col < len(line) and line[col] != ' ':
+        for row in range(self.map.height - 1, -1, -1):
+            if self.map.get(col, row, SPACE) != SPACE:
                 return Position(col, row)
         raise Exception("Empty row found")
 
     def check_tile(self, pos: Position) -> str:
-        if pos.y not in range(0, len(self.map)) or pos.x not in range(0, len(self.map[pos.y])):
-            return ' '
-        return self.map[pos.y][pos.x]
+        return chr(self.map.get(pos.x, pos.y, SPACE))
 
     def step(self, player: Player, steps: int) -> Player:
         for _ in range(steps):
@@ -164,10 +166,6 @@ class PasswordJungle(ABC):
         return player
 
 
-def max_width(map: list[str]) -> int:
-    return max(len(row) for row in map)
-
-
 @dataclass(slots=True, frozen=True)
 class Vector:
     x: int
@@ -229,12 +227,12 @@ class PasswordCubeJungle(PasswordJungle):
             cube_position = cube_position.turn(Turn.Left)
 
     def __post_init__(self):
-        width = max_width(self.map)
-        if len(self.map) % 3 == 0:
+        width = self.map.width
+        if self.map.height % 3 == 0:
             assert width % 4 == 0
-            self.cube_width = len(self.map) // 3
+            self.cube_width = self.map.height // 3
         elif width % 3 == 0:
-            assert len(self.map) % 4 == 0
+            assert self.map.height % 4 == 0
             self.cube_width = width // 3
         else:
             assert False, "Unknown cube dimensions"
@@ -5,7 +5,9 @@ from itertools import count, cycle
 
 from typing import Iterator
 
+from advent.common.grid import Grid
 from advent.common.position import Position
+from advent.common.position_array import PositionArray
 
 day_num = 23
 
@@ -33,12 +35,74 @@ class Direction(IntEnum):
     def next(self) -> Direction:
         return Direction((self + 1) % 4)
 
-    def walk(self, position: Position) -> Position:
+    def step(self, width: int) -> int:
+        """ The offset of the flat index when walking in this direction on a grid of width """
         match self:
-            case Direction.North: return Position(position.x, position.y - 1)
-            case Direction.South: return Position(position.x, position.y + 1)
-            case Direction.West: return Position(position.x - 1, position.y)
-            case Direction.East: return Position(position.x + 1, position.y)
+            case Direction.North: return -width
+            case Direction.South: return width
+            case Direction.West: return -1
+            case Direction.East: return 1
+
+    def checked(self, width: int) -> tuple[int, int, int]:
+        """ The offsets of the three cells that must be free to walk in this direction """
+        match self:
+            case Direction.North: return -width - 1, -width, -width + 1
+            case Direction.South: return width - 1, width, width + 1
+            case Direction.West: return -width - 1, -1, width - 1
+            case Direction.East: return -width + 1, 1, width + 1
+
+
+ELF = 1
+
+# Free rows and columns around the elves, so the grid does not need to grow too often
+MARGIN = 8
+
+
+@dataclass(slots=True)
+class ElfGrid:
+    """
+    The elves on a grid with a free border around them. Each elf is stored with the flat
+    index of its cell and the round in which it or one of its neighbors moved last.
+    origin is the position on the ground of the first grid cell
+    """
+    grid: Grid
+    origin: Position
+    elves: dict[int, int]
+
+    @classmethod
+    def create(cls, elves: dict[Position, int]) -> ElfGrid:
+        positions = PositionArray.from_positions(elves)
+        origin = positions.component_min() - Position.splat(MARGIN)
+        extent = positions.component_max() + Position.splat(MARGIN) - origin
+        grid = Grid.create(extent.x + 1, extent.y + 1)
+        indexed: dict[int, int] = {}
+        for position, touched in elves.items():
+            index = grid.index(position.x - origin.x, position.y - origin.y)
+            grid.cells[index] = ELF
+            indexed[index] = touched
+        return cls(grid, origin, indexed)
+
+    def positions(self) -> dict[Position, int]:
+        return {self.grid.position(index) + self.origin: touched
+                for index, touched in self.elves.items()}
+
+    def near_border(self, index: int) -> bool:
+        """ Elves need two free cells to the border, as they look around after one step """
+        y, x = divmod(index, self.grid.width)
+        return x < 2 or y < 2 or x >= self.grid.width - 2 or y >= self.grid.height - 2
+
+    def pair_neighbors(self, from_pos: int, to_pos: int) -> tuple[int, ...]:
+        """ The eight cells around an elf that moved from from_pos to to_pos """
+        width = self.grid.width
+        first, last = min(from_pos, to_pos), max(from_pos, to_pos)
+        if last - first == width:
+            return (first - width - 1, first - width, first - width + 1,
+                    from_pos - 1, from_pos + 1,
+                    last + width - 1, last + width, last + width + 1)
+        else:
+            return (first - 1 - width, first - 1, first - 1 + width,
+                    from_pos - width, from_pos + width,
+                    last + 1 - width, last + 1, last + 1 + width)
 
 
 @dataclass(slots=True)
@@ -57,35 +121,6 @@ class Ground:
             result += '\n'
         return result[:-1]
 
-    @classmethod
-    def has_neighbor(cls, elves: dict[Position, int],
-                     position: Position, direction: Direction) -> bool:
-        match direction:
-            case Direction.North:
-                return (
-                    Position(position.x - 1, position.y - 1) in elves
-                    or Position(position.x, position.y - 1) in elves
-                    or Position(position.x + 1, position.y - 1) in elves
-                )
-            case Direction.South:
-                return (
-                    Position(position.x - 1, position.y + 1) in elves
-                    or Position(position.x, position.y + 1) in elves
-                    or Position(position.x + 1, position.y + 1) in elves
-                )
-            case Direction.West:
-                return (
-                    Position(position.x - 1, position.y - 1) in elves
-                    or Position(position.x - 1, position.y) in elves
-                    or Position(position.x - 1, position.y + 1) in elves
-                )
-            case Direction.East:
-                return (
-                    Position(position.x + 1, position.y - 1) in elves
-                    or Position(position.x + 1, position.y) in elves
-                    or Position(position.x + 1, position.y + 1) in elves
-                )
-
     def count_empty(self) -> int:
         min_pos, max_pos = self.extent()
         return (max_pos.x - min_pos.x + 1) * (max_pos.y - min_pos.y + 1) - len(self.map)
@@ -100,34 +135,8 @@ class Ground:
         return Ground(map)
 
     def extent(self) -> tuple[Position, Position]:
-        return Position.component_min(*self.map), Position.component_max(*self.map)
-
-    @classmethod
-    def minmax(cls, first: int, second: int) -> tuple[int, int]:
-        return (first, second) if first <= second else (second, first)
-
-    @classmethod
-    def pair_neighbors(cls, from_pos: Position, to_pos: Position) -> Iterator[Position]:
-        if from_pos.x == to_pos.x:
-            mn, mx = Ground.minmax(from_pos.y, to_pos.y)
-            yield Position(from_pos.x - 1, mn - 1)
-            yield Position(from_pos.x, mn - 1)
-            yield Position(from_pos.x + 1, mn - 1)
-            yield Position(from_pos.x - 1, from_pos.y)
-            yield Position(from_pos.x + 1, from_pos.y)
-            yield Position(from_pos.x - 1, mx + 1)
-            yield Position(from_pos.x, mx + 1)
-            yield Position(from_pos.x + 1, mx + 1)
-        else:
-            mn, mx = Ground.minmax(from_pos.x, to_pos.x)
-            yield Position(mn - 1, from_pos.y - 1)
-            yield Position(mn - 1, from_pos.y)
-            yield Position(mn - 1, from_pos.y + 1)
-            yield Position(from_pos.x, from_pos.y - 1)
-            yield Position(from_pos.x, from_pos.y + 1)
-            yield Position(mx + 1, from_pos.y - 1)
-            yield Position(mx + 1, from_pos.y)
-            yield Position(mx + 1, from_pos.y + 1)
+        positions = PositionArray.from_positions(self.map)
+        return positions.component_min(), positions.component_max()
 
     def rounds(self, max_rounds: int | None) -> int | None:
         start_dispenser = cycle(iter(Direction))
@@ -136,35 +145,42 @@ class Ground:
         else:
             it = range(1, max_rounds + 1)
 
-        elves = {position: 0 for position in self.map}
+        elf_grid = ElfGrid.create({position: 0 for position in self.map})
 
         for round in it:
             start = next(start_dispenser)
-            proposals: dict[Position, Position] = {}
-            touched: set[Position] = set()
+            cells = elf_grid.grid.cells
+            elves = elf_grid.elves
+            width = elf_grid.grid.width
+            around = (-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1)
+            checked = [direction.checked(width) for direction in Direction]
+
+            proposals: dict[int, int] = {}
+            touched: set[int] = set()
             for from_pos, last_touched in elves.items():
                 if last_touched + 4 <= round:
                     continue
 
-                found = False
-                for neighbor in from_pos.all_neighbors():
-                    if neighbor in elves:
-                        found = True
+                for offset in around:
+                    if cells[from_pos + offset] == ELF:
                         break
-
-                if not found:
+                else:
                     continue
 
                 next_direction = start
                 found = True
-                while Ground.has_neighbor(elves, from_pos, next_direction):
+                while True:
+                    first, second, third = checked[next_direction]
+                    if (cells[from_pos + first] != ELF and cells[from_pos + second] != ELF
+                            and cells[from_pos + third] != ELF):
+                        break
                     next_direction = next_direction.next()
                     if next_direction == start:
                         found = False
                         break
 
                 if found:
-                    to_pos = next_direction.walk(from_pos)
+                    to_pos = from_pos + next_direction.step(width)
                     old_from = proposals.pop(to_pos, None)
                     if old_from is None:
                         proposals[to_pos] = from_pos
@@ -173,19 +189,26 @@ class Ground:
                         touched.add(old_from)
 
             if not proposals:
-                self.map = set(elves)
+                self.map = set(elf_grid.positions())
                 return round
 
+            needs_growing = False
             for to_pos, from_pos in proposals.items():
                 elves[to_pos] = round
                 del elves[from_pos]
+                cells[from_pos] = 0
+                cells[to_pos] = ELF
+                needs_growing = needs_growing or elf_grid.near_border(to_pos)
 
-                for neighbor in Ground.pair_neighbors(from_pos, to_pos):
+                for neighbor in elf_grid.pair_neighbors(from_pos, to_pos):
                     if neighbor in elves:
                         elves[neighbor] = round
 
             for touched_pos in touched:
                 elves[touched_pos] = round
 
-        self.map = set(elves)
+            if needs_growing:
+                elf_grid = ElfGrid.create(elf_grid.positions())
+
+        self.map = set(elf_grid.positions())
         return None
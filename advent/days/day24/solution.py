@@ -1,23 +1,27 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import IntEnum
-from queue import PriorityQueue
 
 from typing import Iterator
 
-from advent.common.position import UNIT_NEG_X, UNIT_NEG_Y, UNIT_X, UNIT_Y, Position
+from advent.common.grid import Grid
+from advent.common.position import (PACKED_UNIT_NEIGHBORS, UNIT_NEG_X, UNIT_NEG_Y, UNIT_X, UNIT_Y,
+                                    Position, unpack)
+from advent.common.position_array import PositionArray
 
 
 day_num = 24
 
 
-def part1(lines: Iterator[str]) -> int:
-    valley = Valley.parse(lines)
+def parse(lines: Iterator[str]) -> Valley:
+    return Valley.parse(lines)
+
+
+def part1(valley: Valley) -> int:
     return valley.find_way(1)
 
 
-def part2(lines: Iterator[str]) -> int:
-    valley = Valley.parse(lines)
+def part2(valley: Valley) -> int:
     return valley.find_way(3)
 
 
@@ -36,6 +40,7 @@ def lcm(num1: int, num2: int) -> int:
 
 BlizList = list[Position]
 BlizTuple = tuple[BlizList, BlizList, BlizList, BlizList]
+BlizArrays = tuple[PositionArray, PositionArray, PositionArray, PositionArray]
 
 
 class Direction(IntEnum):
@@ -69,114 +74,68 @@ class Direction(IntEnum):
             case Direction.South: return "v"
 
 
+CLEAR = ord('.')
+
+
 @dataclass(slots=True, frozen=True)
 class Weather:
-    blizzards: list[dict[Position, str]] = field(repr=False)
+    """ The blizzards for every minute until they repeat, each as a grid of the valley """
+    blizzards: list[Grid] = field(repr=False)
     extent: Position
     repeat: int
 
     def print(self, time: int) -> list[str]:
         current = self.blizzards[self.normal_time(time)]
-        lines: list[str] = []
-        for row in range(self.extent.y):
-            line = ""
-            for col in range(self.extent.x):
-                if (char := current.get(Position(col, row))) is not None:
-                    line += char
-                else:
-                    line += '.'
-            lines.append(line)
-        return lines
+        return [current.row_str(row) for row in range(current.height)]
 
     def normal_time(self, time: int) -> int:
         return time % self.repeat
 
-    def get(self, time: int) -> dict[Position, str]:
+    def get(self, time: int) -> Grid:
         return self.blizzards[time % self.repeat]
 
     @classmethod
     def predict_weather(cls, blizzards: BlizTuple, extent: Position) -> Weather:
         repeat = lcm(extent.x, extent.y)
-        weather: list[dict[Position, str]] = [Weather.create_dict(blizzards)]
+        arrays: BlizArrays = tuple(PositionArray.from_positions(directed)
+                                   for directed in blizzards)
+        weather: list[Grid] = [Weather.create_grid(arrays, extent)]
         for _ in range(repeat - 1):
-            blizzards = Weather.progress_blizzards(blizzards, extent)
-            weather.append(Weather.create_dict(blizzards))
+            arrays = Weather.progress_blizzards(arrays, extent)
+            weather.append(Weather.create_grid(arrays, extent))
 
         return Weather(weather, extent, repeat)
 
     @classmethod
-    def move_east(cls, blizzards: BlizList, extent: Position) -> BlizList:
-        add = Direction.East.position()
-        result: BlizList = []
-        for pos in blizzards:
-            next_pos = pos + add
-            if next_pos.x >= extent.x:
-                next_pos = next_pos.set_x(0)
-            result.append(next_pos)
-
-        return result
-
-    @classmethod
-    def move_west(cls, blizzards: BlizList, extent: Position) -> BlizList:
-        add = Direction.West.position()
-        result: BlizList = []
-        for pos in blizzards:
-            next_pos = pos + add
-            if next_pos.x < 0:
-                next_pos = next_pos.set_x(extent.x - 1)
-            result.append(next_pos)
-
-        return result
+    def move(cls, blizzards: PositionArray, direction: Direction,
+             extent: Position) -> PositionArray:
+        """ Moves all blizzards one step in the direction, wrapping around at the walls """
+        return (blizzards + direction.position()).wrap(extent)
 
     @classmethod
-    def move_south(cls, blizzards: BlizList, extent: Position) -> BlizList:
-        add = Direction.South.position()
-        result: BlizList = []
-        for pos in blizzards:
-            next_pos = pos + add
-            if next_pos.y >= extent.y:
-                next_pos = next_pos.set_y(0)
-            result.append(next_pos)
-
-        return result
-
-    @classmethod
-    def move_north(cls, blizzards: BlizList, extent: Position) -> BlizList:
-        add = Direction.North.position()
-        result: BlizList = []
-        for pos in blizzards:
-            next_pos = pos + add
-            if next_pos.y < 0:
-                next_pos = next_pos.set_y(extent.y - 1)
-            result.append(next_pos)
-
-        return result
-
-    @classmethod
-    def _add_list(cls, map: dict[Position, str], lst: BlizList, char: str) -> dict[Position, str]:
-        for position in lst:
-            match map.get(position):
-                case None: map[position] = char
-                case '2': map[position] = '3'
-                case '3': map[position] = '4'
-                case _: map[position] = '2'
+    def _add_list(cls, map: Grid, blizzards: PositionArray, char: str) -> Grid:
+        cells = map.cells
+        for x, y in zip(blizzards.xs, blizzards.ys):
+            index = map.index(x, y)
+            match chr(cells[index]):
+                case '.': cells[index] = ord(char)
+                case '2': cells[index] = ord('3')
+                case '3': cells[index] = ord('4')
+                case _: cells[index] = ord('2')
         return map
 
     @classmethod
-    def create_dict(cls, blizzards: BlizTuple) -> dict[Position, str]:
-        map = Weather._add_list({}, blizzards[0], Direction.East.char)
+    def create_grid(cls, blizzards: BlizArrays, extent: Position) -> Grid:
+        map = Grid.create(extent.x, extent.y, CLEAR)
+        map = Weather._add_list(map, blizzards[0], Direction.East.char)
         map = Weather._add_list(map, blizzards[1], Direction.North.char)
         map = Weather._add_list(map, blizzards[2], Direction.West.char)
         return Weather._add_list(map, blizzards[3], Direction.South.char)
 
     @classmethod
-    def progress_blizzards(cls, blizzards: BlizTuple, extent: Position) -> BlizTuple:
-        return (
-            Weather.move_east(blizzards[0], extent),
-            Weather.move_north(blizzards[1], extent),
-            Weather.move_west(blizzards[2], extent),
-            Weather.move_south(blizzards[3], extent),
-        )
+    def progress_blizzards(cls, blizzards: BlizArrays, extent: Position) -> BlizArrays:
+        return tuple(Weather.move(directed, direction, extent)
+                     for direction, directed in zip(Direction, blizzards))
 
 
 @dataclass(slots=True, frozen=True)
@@ -242,96 +201,45 @@ class Valley:
         return lines
 
     def find_way(self, rounds: int) -> int:
-        queue: PriorityQueue[Step] = PriorityQueue()
-        queue.put(Step(
-            position=self.start,
-            time=0,
-            round=0,
-            valley=self,
-            start=self.start,
-            target=self.exit))
-        reached: set[tuple[Position, int, int]] = set()
-        while not queue.empty():
-            current = queue.get()
-            if current.round == rounds:
-                return current.time
-
-            normal_time = self.weather.normal_time(current.time)
-            if (current.position, normal_time, current.round) in reached:
-                continue
-
-            reached.add((current.position, normal_time, current.round))
-            for next in current.possible_moves():
-                queue.put(next)
+        """
+        Returns the time needed to walk [rounds] times between start and exit. As one can
+        always wait at the start and the exit, it is best to reach each of them as early
+        as possible, so every crossing can be searched on its own
+        """
+        time = 0
+        start, target = self.start, self.exit
+        for _ in range(rounds):
+            time = self.cross(start, target, time)
+            start, target = target, start
+        return time
+
+    def cross(self, start: Position, target: Position, time: int) -> int:
+        """
+        Returns the earliest time to reach target when leaving start at the given time.
+        Searches breadth first through time, each minute's positions are packed ints
+        """
+        packed_target = target.pack()
+        moves = (0,) + PACKED_UNIT_NEIGHBORS
+        reachable: set[int] = {start.pack()}
+        while reachable:
+            time += 1
+            weather = self.weather.get(time)
+            cells = weather.cells
+            next_reachable: set[int] = set()
+            for current in reachable:
+                for move in moves:
+                    next_position = current + move
+                    if next_position == packed_target:
+                        return time
+                    if next_position in next_reachable:
+                        continue
+                    x, y = unpack(next_position)
+                    if 0 <= x < self.extent.x and 0 <= y < self.extent.y:
+                        if cells[y * weather.width + x] == CLEAR:
+                            next_reachable.add(next_position)
+                    elif next_position == current:
+                        # waiting outside the valley at the start is always possible
+                        next_reachable.add(next_position)
+            reachable = next_reachable
 
         raise Exception("No path found")
-
-
-@dataclass(slots=True, kw_only=True)
-class Step:
-    position: Position
-    time: int
-    round: int
-    start: Position
-    target: Position
-    valley: Valley
-
-    def __lt__(self, other: Step) -> bool:
-        return self.time < other.time
-
-    def __str__(self) -> str:
-        return '\n'.join(self.print())
-
-    def print(self) -> list[str]:
-        lines = self.valley.print(self.time)
-
-        line = lines[self.position.y + 1]
-        lines[self.position.y + 1] = line[:self.position.x + 1] + \
-            'E' + line[self.position.x + 2:]
-
-        return lines
-
-    def reach_target(self) -> Step:
-        path = Step(position=self.target,
-                    time=self.time + 1,
-                    round=self.round + 1,
-                    valley=self.valley,
-                    start=self.target,
-                    target=self.start,
-                    )
-        return path
-
-    def move(self, position: Position) -> Step:
-        return Step(position=position,
-                    time=self.time + 1,
-                    round=self.round,
-                    valley=self.valley,
-                    start=self.start,
-                    target=self.target,
-                    )
-
-    def wait(self) -> Step:
-        return Step(position=self.position,
-                    time=self.time + 1,
-                    round=self.round,
-                    valley=self.valley,
-                    start=self.start,
-                    target=self.target,
-                    )
-
-    def possible_moves(self) -> Iterator[Step]:
-        impassable = self.valley.weather.get(self.time + 1)
-
-        if self.position not in impassable:
-            yield self.wait()
-
-        for dir in Direction:
-            add = dir.position()
-            next_position = self.position + add
-            if next_position == self.target:
-                yield self.reach_target()
-
-            elif (0 <= next_position.x < self.valley.extent.x
-                    and 0 <= next_position.y < self.valley.extent.y):
-                if next_position not in impassable:
-                    yield self.move(next_position)
@@ -1,20 +1,20 @@
 from advent.common import input
 from advent.common.position import Position
 
-from .solution import BlizTuple, Valley, day_num, part1, part2
+from .solution import BlizTuple, Valley, day_num, parse, part1, part2
 
 
 def test_part1():
     lines = input.read_lines(day_num, 'example01.txt')
     expected = 18
-    result = part1(lines)
+    result = part1(parse(lines))
     assert result == expected
 
 
 def test_part2():
     lines = input.read_lines(day_num, 'example01.txt')
     expected = 54
-    result = part2(lines)
+    result = part2(parse(lines))
     assert result == expected
 
 
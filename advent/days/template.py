@@ -15,9 +15,31 @@ class Day(typing.Protocol):
         ...
 
 
+class ParsingDay(Day, typing.Protocol):
+    """
+    A day that parses its input only once. The runner calls parse with the lines
+    and hands the parsed object to both parts instead of the lines
+    """
+    @staticmethod
+    def parse(lines: typing.Iterator[str]) -> typing.Any:
+        ...
+
+    @staticmethod
+    def part1(parsed: typing.Any) -> ResultType | None:  # type: ignore[override]
+        ...
+
+    @staticmethod
+    def part2(parsed: typing.Any) -> ResultType | None:  # type: ignore[override]
+        ...
+
+
 def is_day(object: typing.Any) -> typing.TypeGuard[Day]:
     try:
         return (isinstance(object.day_num, int)
                 and callable(object.part1) and callable(object.part2))
     except AttributeError:
         return False
+
+
+def has_parse(day: Day) -> typing.TypeGuard[ParsingDay]:
+    return callable(getattr(day, 'parse', None))
@@ -0,0 +1,59 @@
+from __future__ import annotations
+import cProfile
+from pathlib import Path
+import pstats
+import tracemalloc
+
+from typing import Callable, TypeVar
+
+T = TypeVar('T')
+
+
+def profile_call(action: Callable[[], T], top: int, dump: Path | None = None) -> T:
+    """
+    Runs action within cProfile and prints the [top] functions sorted by cumulative
+    and by own time. If dump is given, the raw statistics are written there as well,
+    so that they can be examined with pstats or any other viewer
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(action)
+
+    stats = pstats.Stats(profiler).strip_dirs()
+    print(f"\n--- Top {top} functions by cumulative time ---")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    print(f"--- Top {top} functions by own time ---")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+
+    if dump is not None:
+        stats.dump_stats(dump)
+        print(f"Statistics written to {dump}")
+
+    return result
+
+
+def trace_memory(action: Callable[[], T], top: int) -> T:
+    """
+    Runs action with tracemalloc and prints the peak memory and the [top] sites of the
+    allocations that are still alive when it returns. Temporaries only count for the peak
+    """
+    tracemalloc.start()
+    try:
+        result = action()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # leave out the bookkeeping of the tools themselves
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, pstats.__file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    ])
+    print(f"\n--- Peak memory: {peak / 1024:0.1f} KiB ---")
+    print(f"--- Top {top} sites of retained allocations ---")
+    for stat in snapshot.statistics('lineno')[:top]:
+        print(stat)
+
+    return result
@@ -0,0 +1,39 @@
+from .bench import Statistics, compare
+
+
+def test_statistics():
+    timings = [50, 10, 40, 30, 20]
+    expected = Statistics(5, 10, 30, 50)
+    result = Statistics.create(timings)
+    assert result == expected
+
+
+def test_statistics_p95_nearest_rank():
+    timings = list(range(100, 0, -1))
+    result = Statistics.create(timings)
+    assert result.p95 == 95
+    assert result.median == 50
+
+
+def test_statistics_single_run():
+    expected = Statistics(1, 7, 7, 7)
+    result = Statistics.create([7])
+    assert result == expected
+
+
+def test_compare_threshold():
+    baseline = {'01/1': Statistics(1, 100, 100, 100),
+                '01/2': Statistics(1, 100, 100, 100),
+                '02/1': Statistics(1, 100, 100, 100)}
+    results = {'01/1': Statistics(1, 110, 110, 110),
+               '01/2': Statistics(1, 111, 111, 111),
+               '02/1': Statistics(1, 50, 50, 50)}
+    expected = ['01/2']
+    result = compare(results, baseline, 0.1)
+    assert result == expected
+
+
+def test_compare_missing_baseline():
+    results = {'03/1': Statistics(1, 1000, 1000, 1000)}
+    result = compare(results, {}, 0.1)
+    assert result == []